@@ -1,11 +1,37 @@
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, Response, request, jsonify, session, current_app, stream_with_context
 from src.models.user_model import UserModel
+from src.models.rollup_model import RollupModel, ROLLUP_MAX_DAYS
+from src.models.blog_model import BlogModel
+from src.models.job_model import JobModel, JOB_FIELDS
 from src.database.connection import db_connection
+from src.services.cache import TTLCache, cache_stats
+from src.services.analysis_pool import analysis_pool
+from src.services.score_writer import score_writer
+from src.services.counter_buffer import blog_counters
+from src.services.blog_index import blog_index
+from src.services.data_files import ndjson_stream, csv_stream, read_ndjson, read_csv
 from datetime import datetime, timedelta
 from bson import ObjectId
+import os
 
 admin_bp = Blueprint('admin', __name__)
 user_model = UserModel()
+rollup_model = RollupModel()
+blog_model = BlogModel()
+job_model = JobModel()
+user_count_cache = TTLCache('admin_user_count', max_entries=1, ttl_seconds=60)
+# Dashboard figures are recomputed at most this often per process
+dashboard_cache = TTLCache('admin_dashboard', max_entries=1, ttl_seconds=int(os.getenv('DASHBOARD_CACHE_TTL_SECONDS', 15)))
+
+# Documents read per database round trip while exporting
+EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', 500))
+EXPORT_FORMATS = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+USER_EXPORT_COLUMNS = ('user_id', 'phone_number', 'is_admin', 'created_at', 'last_login', 'score_type', 'score', 'paid', 'source', 'scored_at')
+JOB_EXPORT_COLUMNS = ('id',) + JOB_FIELDS + ('updated_at',)
+# Jobs inserted per insert_many, and the largest import accepted
+JOB_IMPORT_BATCH_SIZE = int(os.getenv('JOB_IMPORT_BATCH_SIZE', 500))
+JOB_IMPORT_MAX_ROWS = int(os.getenv('JOB_IMPORT_MAX_ROWS', 100000))
+JOB_IMPORT_MAX_SIZE = int(os.getenv('JOB_IMPORT_MAX_SIZE', 50 * 1024 * 1024))
 
 def require_admin():
     """Decorator to require admin authentication"""
@@ -17,6 +43,59 @@ def require_admin():
     
     return None
 
+def export_response(body, export_format, name):
+    """Streamed download of an export body"""
+    filename = f"{name}-{datetime.utcnow().strftime('%Y%m%d')}.{export_format}"
+    return Response(
+        stream_with_context(body),
+        mimetype=EXPORT_FORMATS[export_format],
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
+def user_export_document(user):
+    return {
+        'id': str(user['_id']),
+        'phone_number': user.get('phone_number'),
+        'is_admin': user.get('is_admin', False),
+        'created_at': user.get('created_at'),
+        'last_login': user.get('last_login'),
+        'ats_scores': user['ats_scores'],
+        'linkedin_scores': user['linkedin_scores']
+    }
+
+def user_export_rows(users):
+    """One CSV row per score, or a single row for a user with no scores"""
+    for user in users:
+        row = {
+            'user_id': str(user['_id']),
+            'phone_number': user.get('phone_number'),
+            'is_admin': user.get('is_admin', False),
+            'created_at': user.get('created_at'),
+            'last_login': user.get('last_login')
+        }
+        scores = [
+            ('ats', score.get('score'), score.get('paid', False), score.get('filename'), score.get('timestamp'))
+            for score in user['ats_scores']
+        ] + [
+            ('linkedin', score.get('overall_score'), score.get('paid', False), score.get('profile_url'), score.get('timestamp'))
+            for score in user['linkedin_scores']
+        ]
+        if not scores:
+            yield row
+        for score_type, score, paid, source, scored_at in scores:
+            yield dict(row, score_type=score_type, score=score, paid=paid, source=source, scored_at=scored_at)
+
+def encode_user_cursor(user):
+    # Users without a created_at date are paged by _id alone, after everyone else
+    created_at = user.get('created_at')
+    return f"{created_at.isoformat() if isinstance(created_at, datetime) else ''}_{user['_id']}"
+
+def decode_user_cursor(cursor):
+    created_at, _, user_id = cursor.partition('_')
+    if not ObjectId.is_valid(user_id):
+        raise ValueError('Invalid cursor')
+    return (datetime.fromisoformat(created_at) if created_at else None), ObjectId(user_id)
+
 @admin_bp.route('/dashboard', methods=['GET'])
 def get_dashboard_stats():
     """Get admin dashboard statistics"""
@@ -25,25 +104,23 @@ def get_dashboard_stats():
         return auth_error
     
     db = db_connection.get_database()
-    if not db:
+    if db is None:
         return jsonify({'error': 'Database connection failed'}), 500
     
     try:
-        # Get user statistics
-        user_stats = user_model.get_user_stats()
-        
-        # Get recent activity (last 30 days)
+        # Totals and last-30-day figures in one aggregation, shared by concurrent requests
         thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-        recent_users = db.users.count_documents({
-            'created_at': {'$gte': thirty_days_ago}
-        })
+        figures = dashboard_cache.get_or_compute('dashboard', lambda: user_model.stats.get_dashboard(thirty_days_ago))
+        if figures is None:
+            return jsonify({'error': 'Database connection failed'}), 500
         
         # Mock additional statistics
         stats = {
-            'total_users': user_stats.get('total_users', 0),
-            'total_ats_checks': user_stats.get('total_ats_checks', 0),
-            'total_linkedin_reviews': user_stats.get('total_linkedin_reviews', 0),
-            'recent_users': recent_users,
+            'total_users': figures['total_users'],
+            'total_ats_checks': figures['total_ats_checks'],
+            'total_linkedin_reviews': figures['total_linkedin_reviews'],
+            'recent_users': figures['recent_users'],
+            'signups_by_day': figures['signups_by_day'],
             'revenue': {
                 'this_month': 45000,  # Mock revenue
                 'last_month': 38000,
@@ -64,47 +141,50 @@ def get_dashboard_stats():
 
 @admin_bp.route('/users', methods=['GET'])
 def get_users():
-    """Get all users with pagination"""
+    """Get users newest first, paginated by a (created_at, id) cursor"""
     auth_error = require_admin()
     if auth_error:
         return auth_error
     
     db = db_connection.get_database()
-    if not db:
+    if db is None:
         return jsonify({'error': 'Database connection failed'}), 500
     
     try:
-        page = int(request.args.get('page', 1))
-        limit = int(request.args.get('limit', 20))
-        skip = (page - 1) * limit
-        
-        # Get users with pagination
-        users_cursor = db.users.find({}).sort('created_at', -1).skip(skip).limit(limit)
+        limit = min(max(int(request.args.get('limit', 20)), 1), 100)
+        cursor = request.args.get('cursor')
+        after = decode_user_cursor(cursor) if cursor else None
+    except ValueError:
+        return jsonify({'error': 'Invalid limit or cursor'}), 400
+    
+    try:
+        page_users, has_next = user_model.get_users_page(limit, after)
         users = []
         
-        for user in users_cursor:
+        for user in page_users:
             users.append({
                 'id': str(user['_id']),
                 'phone_number': user['phone_number'],
                 'is_admin': user.get('is_admin', False),
-                'created_at': user['created_at'].isoformat() if user.get('created_at') else None,
-                'last_login': user['last_login'].isoformat() if user.get('last_login') else None,
-                'ats_checks': len(user.get('ats_scores', [])),
-                'linkedin_reviews': len(user.get('linkedin_scores', []))
+                'created_at': user.get('created_at'),
+                'last_login': user.get('last_login'),
+                'ats_checks': user['ats_checks'],
+                'linkedin_reviews': user['linkedin_reviews']
             })
         
-        # Get total count for pagination
-        total_users = db.users.count_documents({})
-        total_pages = (total_users + limit - 1) // limit
+        # Approximate total from collection metadata, refreshed at most once a minute
+        total_users = user_count_cache.get('users')
+        if total_users is None:
+            total_users = db.users.estimated_document_count()
+            user_count_cache.set('users', total_users)
         
         return jsonify({
             'users': users,
             'pagination': {
-                'current_page': page,
-                'total_pages': total_pages,
-                'total_users': total_users,
-                'has_next': page < total_pages,
-                'has_prev': page > 1
+                'limit': limit,
+                'next_cursor': encode_user_cursor(page_users[-1]) if has_next else None,
+                'has_next': has_next,
+                'total_users': total_users
             }
         })
         
@@ -119,11 +199,12 @@ def get_jobs():
         return auth_error
     
     db = db_connection.get_database()
-    if not db:
+    if db is None:
         return jsonify({'error': 'Database connection failed'}), 500
     
     try:
-        jobs_cursor = db.jobs.find({}).sort('created_at', -1)
+        fields = {'title': 1, 'company': 1, 'location': 1, 'job_type': 1, 'salary_range': 1, 'status': 1, 'created_at': 1}
+        jobs_cursor = db.jobs.find({}, fields).sort('created_at', -1)
         jobs = []
         
         for job in jobs_cursor:
@@ -135,7 +216,7 @@ def get_jobs():
                 'job_type': job.get('job_type', 'Full-time'),
                 'salary_range': job.get('salary_range', 'Not specified'),
                 'status': job.get('status', 'active'),
-                'created_at': job['created_at'].isoformat() if job.get('created_at') else None
+                'created_at': job.get('created_at')
             })
         
         return jsonify({'jobs': jobs})
@@ -143,6 +224,54 @@ def get_jobs():
     except Exception as e:
         return jsonify({'error': f'Failed to fetch jobs: {str(e)}'}), 500
 
+@admin_bp.route('/jobs/import', methods=['POST'])
+def import_jobs():
+    """Create job postings in bulk.
+
+    Takes a CSV (with a header row; requirements separated by ';') or NDJSON
+    upload named 'file', or a JSON body {"jobs": [...]}. Valid rows are
+    inserted in batches; invalid ones, including CSV rows that are not
+    valid UTF-8, are reported by row number. A CSV the parser cannot read
+    past (such as a field over the csv module's size limit) ends the
+    import at that row, and its error says the rest was not processed.
+    """
+    auth_error = require_admin()
+    if auth_error:
+        return auth_error
+    
+    db = db_connection.get_database()
+    if db is None:
+        return jsonify({'error': 'Database connection failed'}), 500
+    
+    request.max_content_length = JOB_IMPORT_MAX_SIZE
+    upload = request.files.get('file')
+    if upload is not None and upload.filename:
+        import_format = request.form.get('format') or upload.filename.rsplit('.', 1)[-1].lower()
+        if import_format == 'csv':
+            rows = read_csv(upload.stream)
+        elif import_format in ('ndjson', 'jsonl'):
+            rows = read_ndjson(upload.stream)
+        else:
+            return jsonify({'error': 'Upload a .csv or .ndjson file'}), 400
+    else:
+        data = request.get_json(silent=True) or {}
+        jobs = data.get('jobs')
+        if not isinstance(jobs, list):
+            return jsonify({'error': 'Upload a file or send {"jobs": [...]}'}), 400
+        rows = ((index, job, None) for index, job in enumerate(jobs, 1))
+    
+    try:
+        summary = job_model.import_jobs(
+            rows,
+            ObjectId(session.get('user_id')),
+            batch_size=JOB_IMPORT_BATCH_SIZE,
+            max_rows=JOB_IMPORT_MAX_ROWS
+        )
+    except Exception as e:
+        return jsonify({'error': f'Failed to import jobs: {str(e)}'}), 500
+    
+    return jsonify(summary)
+
 @admin_bp.route('/jobs', methods=['POST'])
 def create_job():
     """Create a new job posting"""
@@ -151,7 +280,7 @@ def create_job():
         return auth_error
     
     db = db_connection.get_database()
-    if not db:
+    if db is None:
         return jsonify({'error': 'Database connection failed'}), 500
     
     try:
@@ -189,7 +318,7 @@ def update_job(job_id):
         return auth_error
     
     db = db_connection.get_database()
-    if not db:
+    if db is None:
         return jsonify({'error': 'Database connection failed'}), 500
     
     try:
@@ -231,7 +360,7 @@ def delete_job(job_id):
         return auth_error
     
     db = db_connection.get_database()
-    if not db:
+    if db is None:
         return jsonify({'error': 'Database connection failed'}), 500
     
     try:
@@ -253,11 +382,13 @@ def get_blogs():
         return auth_error
     
     db = db_connection.get_database()
-    if not db:
+    if db is None:
         return jsonify({'error': 'Database connection failed'}), 500
     
     try:
-        blogs_cursor = db.blog_posts.find({}).sort('created_at', -1)
+        # The list never shows post bodies
+        fields = {'title': 1, 'slug': 1, 'excerpt': 1, 'author': 1, 'published': 1, 'views': 1, 'likes': 1, 'created_at': 1}
+        blogs_cursor = db.blog_posts.find({}, fields).sort('created_at', -1)
         blogs = []
         
         for blog in blogs_cursor:
@@ -270,7 +401,7 @@ def get_blogs():
                 'published': blog.get('published', False),
                 'views': blog.get('views', 0),
                 'likes': blog.get('likes', 0),
-                'created_at': blog['created_at'].isoformat() if blog.get('created_at') else None
+                'created_at': blog.get('created_at')
             })
         
         return jsonify({'blogs': blogs})
@@ -286,7 +417,7 @@ def create_blog():
         return auth_error
     
     db = db_connection.get_database()
-    if not db:
+    if db is None:
         return jsonify({'error': 'Database connection failed'}), 500
     
     try:
@@ -310,7 +441,9 @@ def create_blog():
             'likes': 0
         }
         
-        result = db.blog_posts.insert_one(blog_data)
+        result = db.blog_posts.insert_one(blog_model.prepare_post(blog_data))
+        # Searchable here at once; other processes pick it up on their next index refresh
+        blog_index.add_post(dict(blog_data, _id=result.inserted_id))
         
         return jsonify({
             'message': 'Blog post created successfully',
@@ -320,6 +453,94 @@ def create_blog():
     except Exception as e:
         return jsonify({'error': f'Failed to create blog post: {str(e)}'}), 500
 
+@admin_bp.route('/export/users', methods=['GET'])
+def export_users():
+    """Download every user with their score history as NDJSON (default) or CSV"""
+    auth_error = require_admin()
+    if auth_error:
+        return auth_error
+    
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': 'format must be ndjson or csv'}), 400
+    if db_connection.get_database() is None:
+        return jsonify({'error': 'Database connection failed'}), 500
+    
+    users = user_model.iter_users_with_scores(EXPORT_BATCH_SIZE)
+    if export_format == 'csv':
+        body = csv_stream(user_export_rows(users), USER_EXPORT_COLUMNS)
+    else:
+        body = ndjson_stream((user_export_document(user) for user in users), current_app.json.dumps)
+    return export_response(body, export_format, 'users')
+
+@admin_bp.route('/export/jobs', methods=['GET'])
+def export_jobs():
+    """Download every job posting as NDJSON (default) or CSV"""
+    auth_error = require_admin()
+    if auth_error:
+        return auth_error
+    
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': 'format must be ndjson or csv'}), 400
+    if db_connection.get_database() is None:
+        return jsonify({'error': 'Database connection failed'}), 500
+    
+    jobs = ({'id': str(job.pop('_id')), **job} for job in job_model.iter_jobs(EXPORT_BATCH_SIZE))
+    if export_format == 'csv':
+        body = csv_stream(jobs, JOB_EXPORT_COLUMNS)
+    else:
+        body = ndjson_stream(jobs, current_app.json.dumps)
+    return export_response(body, export_format, 'jobs')
+
+@admin_bp.route('/rollups', methods=['GET'])
+def get_rollups():
+    """Get per-day signups and checks for a date range (defaults to the last 30 days)"""
+    auth_error = require_admin()
+    if auth_error:
+        return auth_error
+    
+    try:
+        today = datetime.utcnow()
+        end = datetime.strptime(request.args['to'], '%Y-%m-%d') if request.args.get('to') else today
+        start = datetime.strptime(request.args['from'], '%Y-%m-%d') if request.args.get('from') else end - timedelta(days=29)
+    except ValueError:
+        return jsonify({'error': 'Dates must be YYYY-MM-DD'}), 400
+    
+    if start > end:
+        return jsonify({'error': "'from' must not be after 'to'"}), 400
+    if (end - start).days >= ROLLUP_MAX_DAYS:
+        return jsonify({'error': f'At most {ROLLUP_MAX_DAYS} days per request'}), 400
+    
+    try:
+        days = rollup_model.get_range(start, end)
+        if days is None:
+            return jsonify({'error': 'Database connection failed'}), 500
+        
+        return jsonify({
+            'from': start.strftime('%Y-%m-%d'),
+            'to': end.strftime('%Y-%m-%d'),
+            'days': days
+        })
+        
+    except Exception as e:
+        return jsonify({'error': f'Failed to fetch rollups: {str(e)}'}), 500
+
+@admin_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Get in-process cache and worker pool counters"""
+    auth_error = require_admin()
+    if auth_error:
+        return auth_error
+    
+    return jsonify({
+        'caches': cache_stats(),
+        'analysis_pool': analysis_pool.stats(),
+        'score_writer': score_writer.stats(),
+        'blog_counters': blog_counters.stats(),
+        'blog_index': blog_index.stats()
+    })
+
 @admin_bp.route('/recent-activity', methods=['GET'])
 def get_recent_activity():
     """Get recent user activity"""
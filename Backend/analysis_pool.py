@@ -0,0 +1,148 @@
+import os
+import time
+import uuid
+import queue
+import atexit
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+class PoolBusyError(Exception):
+    """Raised when the analysis backlog is full"""
+
+class AnalysisPool:
+    """Process pool for CPU-bound resume analysis with a bounded backlog.
+
+    Work runs in separate processes so parsing and scoring never hold the
+    GIL of the process serving requests. At most max_pending jobs may be
+    queued or running; beyond that submit() fails fast instead of letting
+    latency grow without bound. on_done callbacks run on a callback thread
+    of their own, so the database writes they make never hold up the
+    executor's result handling.
+    """
+
+    def __init__(self, max_workers=None, max_pending=None, result_ttl=3600):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.max_workers * 4
+        self.result_ttl = result_ttl
+        self._executor = None
+        self._pid = None
+        self._jobs = {}
+        self._pending = 0
+        self._callbacks = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        # Created on first use, and again after a fork, so every server process owns its own pool
+        if self._pid != os.getpid():
+            # The parent's jobs never finish here, so nothing would settle their counts
+            self._executor = None
+            self._jobs = {}
+            self._pending = 0
+            self._callbacks = queue.Queue()
+            threading.Thread(
+                target=self._run_callbacks, args=(self._callbacks,), name='analysis-callbacks', daemon=True
+            ).start()
+            self._pid = os.getpid()
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return self._executor
+
+    def _expire_jobs(self):
+        cutoff = time.time() - self.result_ttl
+        expired = [job_id for job_id, job in self._jobs.items() if job['finished_at'] and job['finished_at'] < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def submit(self, fn, *args, on_done=None):
+        """Queue fn(*args) in a worker process and return (job_id, future).
+
+        on_done(job_id, result, error) runs on this process's callback
+        thread when the job finishes; its return value is kept as the job's
+        result.
+        """
+        with self._lock:
+            self._expire_jobs()
+            if self._pending >= self.max_pending:
+                raise PoolBusyError(f'Analysis queue is full ({self.max_pending} jobs pending)')
+
+            try:
+                future = self._get_executor().submit(fn, *args)
+            except BrokenProcessPool:
+                # Jobs already on the broken pool keep their entries and pending slots;
+                # their futures fail, so the callback thread marks them failed and frees the slots
+                logging.warning("Analysis pool was broken, starting a new one")
+                self._executor = None
+                future = self._get_executor().submit(fn, *args)
+
+            job_id = uuid.uuid4().hex
+            self._jobs[job_id] = {'future': future, 'finished_at': None, 'result': None, 'error': None}
+            self._pending += 1
+
+        callbacks = self._callbacks
+        future.add_done_callback(lambda done: callbacks.put((job_id, done, on_done)))
+        return job_id, future
+
+    def _run_callbacks(self, callbacks):
+        # Futures complete on the executor's result-handling thread; their follow-up runs here
+        while True:
+            job_id, future, on_done = callbacks.get()
+            try:
+                self._finish(job_id, future, on_done)
+            except Exception as e:
+                logging.error(f"Analysis job {job_id} could not be finished: {e}")
+
+    def _finish(self, job_id, future, on_done):
+        error = future.exception()
+        result = None if error else future.result()
+        if on_done:
+            try:
+                result = on_done(job_id, result, error)
+            except Exception as e:
+                logging.error(f"Analysis job {job_id} callback failed: {e}")
+
+        with self._lock:
+            self._pending -= 1
+            job = self._jobs.get(job_id)
+            if job:
+                job['finished_at'] = time.time()
+                job['result'] = result
+                job['error'] = str(error) if error else None
+
+    def status(self, job_id):
+        """Current state of a job submitted from this process, or None if unknown"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job['finished_at'] is None:
+                return {'status': 'running' if job['future'].running() else 'queued'}
+            if job['error']:
+                return {'status': 'failed', 'error': job['error']}
+            return {'status': 'done', 'result': job['result']}
+
+    def stats(self):
+        with self._lock:
+            return {
+                'workers': self.max_workers,
+                'pending': self._pending,
+                'max_pending': self.max_pending,
+                'tracked_jobs': len(self._jobs)
+            }
+
+    def shutdown(self):
+        if self._executor is not None and self._pid == os.getpid():
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+# Global analysis pool, shared by the ATS routes
+analysis_pool = AnalysisPool(
+    max_workers=int(os.getenv('ATS_POOL_WORKERS', 0)) or None,
+    max_pending=int(os.getenv('ATS_POOL_MAX_PENDING', 0)) or None,
+    result_ttl=int(os.getenv('ATS_JOB_TTL_SECONDS', 3600))
+)
+atexit.register(analysis_pool.shutdown)
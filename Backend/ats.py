@@ -1,154 +1,386 @@
-from flask import Blueprint, request, jsonify, session
-from src.models.user_model import UserModel
+from flask import Blueprint, Response, request, jsonify, session, url_for, current_app, stream_with_context
+from src.models.user_model import UserModel, HISTORY_PAGE_SIZE, HISTORY_MAX_PAGE_SIZE
+from src.models.score_stats_model import ScoreStatsModel
+from src.database.connection import db_connection
+from src.services.resume_parser import file_extension, upload_digest, spool_to_disk, ExtractionError
+from src.services.cache import TTLCache
+from src.services.analysis_pool import analysis_pool, PoolBusyError
+from src.services.ats_engine import generate_ats_score, generate_detailed_analysis, analyse_resume_file
 from werkzeug.utils import secure_filename
+import io
 import os
-import random
+import json
+import time
+import logging
+import zipfile
+from concurrent.futures import wait, FIRST_COMPLETED
 from datetime import datetime
-import hashlib
 
 ats_bp = Blueprint('ats', __name__)
 user_model = UserModel()
 
 ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx'}
 
+# Resume analyses keyed by file type and a SHA-256 of the uploaded bytes
+analysis_cache = TTLCache(
+    'ats_analysis',
+    max_entries=int(os.getenv('ATS_CACHE_MAX_ENTRIES', 5000)),
+    max_bytes=int(os.getenv('ATS_CACHE_MAX_BYTES', 32 * 1024 * 1024)),
+    ttl_seconds=int(os.getenv('ATS_CACHE_TTL_SECONDS', 24 * 3600))
+)
+
+# How long /check and /check-premium wait for a worker before giving up
+ANALYSIS_TIMEOUT_SECONDS = int(os.getenv('ATS_ANALYSIS_TIMEOUT_SECONDS', 30))
+
+# Bulk checks: request size and file count limits, and a smaller in-memory spool per file
+BULK_MAX_CONTENT_LENGTH = int(os.getenv('ATS_BULK_MAX_SIZE', 200 * 1024 * 1024))
+BULK_MAX_FILES = int(os.getenv('ATS_BULK_MAX_FILES', 500))
+BULK_SPOOL_MAX_MEMORY = 32 * 1024
+
+def analysis_key(extension, digest):
+    # The same bytes are parsed differently as a .pdf, .docx or .doc
+    return f'{extension}:{digest}'
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def generate_ats_score(filename, is_paid=False):
-    """Generate ATS score based on filename and payment status"""
-    # Generate a consistent but random-looking score based on filename
-    hash_object = hashlib.md5(filename.encode())
-    hash_hex = hash_object.hexdigest()
-    base_score = int(hash_hex[:2], 16) % 40 + 20  # Score between 20-60 for free
-    
-    if is_paid:
-        # Paid users get higher scores (80-95)
-        paid_score = int(hash_hex[2:4], 16) % 16 + 80
-        return paid_score
-    
-    return base_score
-
-def generate_detailed_analysis(score, is_paid=False):
-    """Generate detailed ATS analysis"""
-    if not is_paid:
-        return {
-            'message': 'Upgrade to premium to get detailed analysis',
-            'available_in_premium': [
-                'Keyword optimization suggestions',
-                'Formatting improvements',
-                'Section-wise analysis',
-                'Industry-specific recommendations',
-                'ATS compatibility score breakdown'
-            ]
-        }
-    
-    # Detailed analysis for paid users
-    return {
-        'keywords_found': random.randint(15, 25),
-        'keywords_missing': random.randint(3, 8),
-        'formatting_score': random.randint(75, 95),
-        'readability_score': random.randint(80, 95),
-        'sections_present': ['experience', 'education', 'skills', 'summary'],
-        'sections_missing': [] if score > 85 else ['certifications'],
-        'recommendations': [
-            'Excellent keyword optimization',
-            'Professional formatting maintained',
-            'Strong ATS compatibility'
-        ] if score > 85 else [
-            'Add more industry-specific keywords',
-            'Improve section organization',
-            'Enhance formatting consistency'
-        ]
-    }
-
-@ats_bp.route('/check', methods=['POST'])
-def check_ats_score():
+def get_uploaded_resume():
+    """Return the uploaded resume, or an error response if the upload is unusable"""
     if 'file' not in request.files:
-        return jsonify({'error': 'No file uploaded'}), 400
+        return None, (jsonify({'error': 'No file uploaded'}), 400)
     
     file = request.files['file']
     if file.filename == '':
-        return jsonify({'error': 'No file selected'}), 400
+        return None, (jsonify({'error': 'No file selected'}), 400)
     
     if not allowed_file(file.filename):
-        return jsonify({'error': 'Invalid file type. Only PDF, DOC, and DOCX files are allowed'}), 400
+        return None, (jsonify({'error': 'Invalid file type. Only PDF, DOC, and DOCX files are allowed'}), 400)
     
-    # Generate ATS score (free version gives lower scores)
-    filename = secure_filename(file.filename)
-    score = generate_ats_score(filename, is_paid=False)
+    return file, None
+
+def submit_analysis(file, on_done=None):
+    """Copy an upload to disk and queue it for a worker process"""
+    extension = file_extension(file.filename)
+    file.stream.seek(0)
+    path, _ = spool_to_disk(file.stream, extension)
+    return submit_path(path, extension, on_done=on_done)
+
+def submit_path(path, extension, on_done=None):
+    """Queue a resume on disk for a worker process, which deletes it when done"""
+    try:
+        return analysis_pool.submit(analyse_resume_file, path, extension, on_done=on_done)
+    except Exception:
+        os.remove(path)
+        raise
+
+def analyse_upload(file):
+    """Extract and analyse an uploaded resume, reusing earlier results for identical bytes"""
+    key = analysis_key(file_extension(file.filename), upload_digest(file.stream))
+    cached = analysis_cache.get(key)
+    if cached is not None:
+        return cached['features'], dict(cached['extraction'], cached=True)
+    
+    _, future = submit_analysis(file)
+    analysis = future.result(timeout=ANALYSIS_TIMEOUT_SECONDS)
+    analysis_cache.set(key, analysis)
+    return analysis['features'], dict(analysis['extraction'], cached=False)
+
+def build_check_result(filename, features, extraction, is_paid=False):
+    """Score an analysed resume; returns the score record and the API response"""
+    score = generate_ats_score(features, is_paid=is_paid)
     
-    # Create score data
     score_data = {
         'filename': filename,
         'score': score,
         'timestamp': datetime.utcnow(),
-        'paid': False,
-        'detailed_analysis': generate_detailed_analysis(score, is_paid=False)
+        'paid': is_paid,
+        'detailed_analysis': generate_detailed_analysis(score, features, is_paid=is_paid)
     }
     
+    if is_paid:
+        response = {
+            'score': score,
+            'filename': filename,
+            'message': f'Premium ATS Analysis Complete! Your score is {score}/100.',
+            'detailed_analysis': score_data['detailed_analysis'],
+            'extraction': extraction
+        }
+    else:
+        response = {
+            'score': score,
+            'filename': filename,
+            'message': f'Your ATS score is {score}/100. Upgrade to premium for detailed analysis and higher accuracy.',
+            'detailed_analysis': score_data['detailed_analysis'],
+            'extraction': extraction,
+            'upgrade_url': 'https://rzp.io/rzp/qIH8G2w'
+        }
+    
+    return score_data, response
+
+def run_check(is_paid):
+    file, error = get_uploaded_resume()
+    if error:
+        return error
+    
+    filename = secure_filename(file.filename)
+    try:
+        features, extraction = analyse_upload(file)
+    except ExtractionError as e:
+        return jsonify({'error': str(e)}), 422
+    except PoolBusyError as e:
+        return jsonify({'error': str(e)}), 503
+    except TimeoutError:
+        return jsonify({'error': 'Resume analysis timed out, please try again'}), 504
+    
+    score_data, response = build_check_result(filename, features, extraction, is_paid=is_paid)
+    
     # Save to user's record if logged in
     user_id = session.get('user_id')
     if user_id:
         user_model.add_ats_score(user_id, score_data)
     
-    return jsonify({
-        'score': score,
-        'filename': filename,
-        'message': f'Your ATS score is {score}/100. Upgrade to premium for detailed analysis and higher accuracy.',
-        'detailed_analysis': score_data['detailed_analysis'],
-        'upgrade_url': 'https://rzp.io/rzp/qIH8G2w'
-    })
+    return jsonify(response)
+
+@ats_bp.route('/check', methods=['POST'])
+def check_ats_score():
+    # Free version gives lower scores
+    return run_check(is_paid=False)
 
 @ats_bp.route('/check-premium', methods=['POST'])
 def check_ats_premium():
     """Premium ATS check with detailed analysis"""
-    if 'file' not in request.files:
-        return jsonify({'error': 'No file uploaded'}), 400
+    return run_check(is_paid=True)
+
+def save_job(job_id, update=None, defaults=None):
+    """Mirror job state to MongoDB so any server process can answer a poll.
+
+    defaults are only written when the job document is first created, so a
+    job that finishes before its 'queued' state is saved keeps its result.
+    """
+    db = db_connection.get_database()
+    if db is None:
+        return
+    change = {'$setOnInsert': dict(defaults or {}, created_at=datetime.utcnow())}
+    if update:
+        change['$set'] = update
+    try:
+        db.ats_jobs.update_one({'_id': job_id}, change, upsert=True)
+    except Exception as e:
+        logging.error(f"Failed to save ATS job {job_id}: {e}")
+
+@ats_bp.route('/jobs', methods=['POST'])
+def submit_ats_job():
+    """Queue an ATS check and return a job id to poll"""
+    file, error = get_uploaded_resume()
+    if error:
+        return error
     
-    file = request.files['file']
-    if file.filename == '':
-        return jsonify({'error': 'No file selected'}), 400
+    filename = secure_filename(file.filename)
+    is_paid = request.form.get('premium', 'false').lower() == 'true'
+    user_id = session.get('user_id')
     
-    if not allowed_file(file.filename):
-        return jsonify({'error': 'Invalid file type. Only PDF, DOC, and DOCX files are allowed'}), 400
+    key = analysis_key(file_extension(file.filename), upload_digest(file.stream))
+    cached = analysis_cache.get(key)
+    if cached is not None:
+        score_data, response = build_check_result(filename, cached['features'], dict(cached['extraction'], cached=True), is_paid=is_paid)
+        if user_id:
+            user_model.add_ats_score(user_id, score_data)
+        return jsonify({'job_id': None, 'status': 'done', 'result': response})
     
-    # Generate premium ATS score (higher scores)
-    filename = secure_filename(file.filename)
-    score = generate_ats_score(filename, is_paid=True)
+    def on_done(job_id, analysis, error):
+        if error:
+            save_job(job_id, {'status': 'failed', 'error': str(error), 'finished_at': datetime.utcnow()})
+            return None
+        
+        analysis_cache.set(key, analysis)
+        score_data, response = build_check_result(filename, analysis['features'], dict(analysis['extraction'], cached=False), is_paid=is_paid)
+        if user_id:
+            user_model.add_ats_score(user_id, score_data)
+        save_job(job_id, {'status': 'done', 'result': response, 'finished_at': datetime.utcnow()})
+        return response
     
-    # Create detailed score data
-    score_data = {
-        'filename': filename,
-        'score': score,
-        'timestamp': datetime.utcnow(),
-        'paid': True,
-        'detailed_analysis': generate_detailed_analysis(score, is_paid=True)
-    }
+    try:
+        job_id, _ = submit_analysis(file, on_done=on_done)
+    except PoolBusyError as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '5'}
     
-    # Save to user's record if logged in
-    user_id = session.get('user_id')
-    if user_id:
-        user_model.add_ats_score(user_id, score_data)
+    save_job(job_id, defaults={'status': 'queued'})
     
     return jsonify({
-        'score': score,
-        'filename': filename,
-        'message': f'Premium ATS Analysis Complete! Your score is {score}/100.',
-        'detailed_analysis': score_data['detailed_analysis']
-    })
+        'job_id': job_id,
+        'status': 'queued',
+        'poll_url': url_for('ats.get_ats_job', job_id=job_id)
+    }), 202
+
+@ats_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_ats_job(job_id):
+    """Poll a queued ATS check"""
+    job = analysis_pool.status(job_id)
+    if job is None:
+        db = db_connection.get_database()
+        if db is not None:
+            job = db.ats_jobs.find_one({'_id': job_id}, {'_id': 0, 'status': 1, 'result': 1, 'error': 1})
+    
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    return jsonify(dict(job, job_id=job_id))
+
+def iter_bulk_resumes(uploads, archive_stream):
+    """Yield (filename, stream) for each resume in a multipart set or a zip archive"""
+    try:
+        for filename, stream in uploads:
+            stream.seek(0)
+            yield filename, stream
+        
+        if archive_stream is None:
+            return
+        
+        with zipfile.ZipFile(archive_stream) as bundle:
+            for member in bundle.infolist():
+                if member.is_dir() or member.filename.startswith('__MACOSX/'):
+                    continue
+                with bundle.open(member) as stream:
+                    yield os.path.basename(member.filename), stream
+    finally:
+        for _, stream in uploads:
+            stream.close()
+        if archive_stream is not None:
+            archive_stream.close()
+
+def stream_bulk_results(resumes, is_paid, max_file_bytes):
+    """Score resumes in parallel and yield one NDJSON line per resume as each finishes"""
+    # Only a few resumes per worker are spooled to disk at a time
+    window = analysis_pool.max_workers * 2
+    in_flight = {}
+    summary = {'total': 0, 'succeeded': 0, 'failed': 0}
+    
+    def result_line(index, filename, response=None, error=None):
+        summary['total'] += 1
+        if error:
+            summary['failed'] += 1
+            payload = {'index': index, 'filename': filename, 'status': 'error', 'error': error}
+        else:
+            summary['succeeded'] += 1
+            payload = dict(response, index=index, status='ok')
+        return json.dumps(payload) + '\n'
+    
+    def collect_finished():
+        done, _ = wait(list(in_flight), timeout=ANALYSIS_TIMEOUT_SECONDS, return_when=FIRST_COMPLETED)
+        if not done:
+            for future, (index, filename, path, _) in list(in_flight.items()):
+                if future.cancel() and os.path.exists(path):
+                    os.remove(path)
+                del in_flight[future]
+                yield result_line(index, filename, error='Resume analysis timed out')
+            return
+        
+        for future in done:
+            index, filename, _, key = in_flight.pop(future)
+            try:
+                analysis = future.result()
+            except Exception as e:
+                yield result_line(index, filename, error=str(e))
+                continue
+            analysis_cache.set(key, analysis)
+            _, response = build_check_result(filename, analysis['features'], dict(analysis['extraction'], cached=False), is_paid=is_paid)
+            yield result_line(index, filename, response=response)
+    
+    for index, (name, stream) in enumerate(resumes):
+        filename = secure_filename(name)
+        if index >= BULK_MAX_FILES:
+            yield result_line(index, filename, error=f'Batch limit of {BULK_MAX_FILES} files reached')
+            resumes.close()
+            break
+        
+        if not allowed_file(name):
+            yield result_line(index, filename, error='Invalid file type. Only PDF, DOC, and DOCX files are allowed')
+            continue
+        
+        extension = file_extension(name)
+        try:
+            path, digest = spool_to_disk(stream, extension, max_bytes=max_file_bytes)
+        except ExtractionError as e:
+            yield result_line(index, filename, error=str(e))
+            continue
+        
+        key = analysis_key(extension, digest)
+        cached = analysis_cache.get(key)
+        if cached is not None:
+            os.remove(path)
+            _, response = build_check_result(filename, cached['features'], dict(cached['extraction'], cached=True), is_paid=is_paid)
+            yield result_line(index, filename, response=response)
+            continue
+        
+        while len(in_flight) >= window:
+            yield from collect_finished()
+        
+        while True:
+            try:
+                _, future = analysis_pool.submit(analyse_resume_file, path, extension)
+                break
+            except PoolBusyError:
+                # Other requests filled the pool; wait for our own work to drain first
+                if in_flight:
+                    yield from collect_finished()
+                else:
+                    time.sleep(0.1)
+        in_flight[future] = (index, filename, path, key)
+    
+    while in_flight:
+        yield from collect_finished()
+    
+    yield json.dumps({'summary': summary}) + '\n'
+
+@ats_bp.route('/check-bulk', methods=['POST'])
+def check_ats_bulk():
+    """Score a batch of resumes, streaming NDJSON results as they complete.
+
+    Accepts either a zip upload named 'archive' or several uploads named
+    'files'. Results are not saved to the caller's history.
+    """
+    request.max_content_length = BULK_MAX_CONTENT_LENGTH
+    request.spool_max_memory = BULK_SPOOL_MAX_MEMORY
+    
+    files = [file for file in request.files.getlist('files') if file.filename]
+    archive = request.files.get('archive')
+    if not files and archive is None:
+        return jsonify({'error': 'Upload a zip archive or one or more resume files'}), 400
+    
+    if archive is not None and not zipfile.is_zipfile(archive.stream):
+        return jsonify({'error': 'Archive must be a zip file'}), 400
+    
+    is_paid = request.form.get('premium', 'false').lower() == 'true'
+    max_file_bytes = current_app.config.get('MAX_CONTENT_LENGTH')
+    
+    # The request closes its uploads as soon as this view returns, before the
+    # streamed body is read, so hand the spools over to the generator instead
+    uploads = [(file.filename, file.stream) for file in files]
+    archive_stream = archive.stream if archive is not None else None
+    for file in files + ([archive] if archive is not None else []):
+        file.stream = io.BytesIO()
+    resumes = iter_bulk_resumes(uploads, archive_stream)
+    
+    return Response(
+        stream_with_context(stream_bulk_results(resumes, is_paid, max_file_bytes)),
+        mimetype='application/x-ndjson'
+    )
 
 @ats_bp.route('/history', methods=['GET'])
 def get_ats_history():
-    """Get user's ATS check history"""
+    """Get a page of the user's ATS check history, newest first"""
     user_id = session.get('user_id')
     if not user_id:
         return jsonify({'error': 'Authentication required'}), 401
     
-    user = user_model.find_user_by_id(user_id)
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
+    try:
+        limit = min(max(int(request.args.get('limit', HISTORY_PAGE_SIZE)), 1), HISTORY_MAX_PAGE_SIZE)
+        cursor = request.args.get('cursor')
+        before = datetime.fromisoformat(cursor) if cursor else None
+    except ValueError:
+        return jsonify({'error': 'Invalid limit or cursor'}), 400
     
-    ats_scores = user.get('ats_scores', [])
+    ats_scores, has_more = user_model.get_ats_history(user_id, limit, before)
     
     # Format the response
     history = []
@@ -160,16 +392,24 @@ def get_ats_history():
             'paid': score_data.get('paid', False)
         })
     
-    return jsonify({'history': history})
+    return jsonify({
+        'history': history,
+        'next_cursor': history[-1]['timestamp'] if has_more else None
+    })
 
 @ats_bp.route('/stats', methods=['GET'])
 def get_ats_stats():
     """Get ATS checker statistics"""
     stats = user_model.get_user_stats()
+    scores = ScoreStatsModel().get('ats')
     
     return jsonify({
         'total_checks': stats.get('total_ats_checks', 0),
-        'average_score': 45,  # Mock average
-        'improvement_rate': '23%'  # Mock improvement rate
+        'average_score': scores['mean'],
+        'score_stddev': scores['stddev'],
+        'score_distribution': scores['histogram'],
+        'improvement_rate': f"{scores['improvement_rate']}%",
+        'average_improvement': scores['average_improvement'],
+        'repeat_users': scores['repeat_users']
     })
 
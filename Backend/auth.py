@@ -1,14 +1,15 @@
 from flask import Blueprint, request, jsonify, session
 from src.models.user_model import UserModel
+from src.services.otp_store import create_otp_store
 import random
+import time
 import os
-from datetime import datetime, timedelta
 
 auth_bp = Blueprint('auth', __name__)
 user_model = UserModel()
 
-# In-memory OTP storage (in production, use Redis or database)
-otp_storage = {}
+# Expiring OTP storage, shared by all workers on this host unless OTP_STORE=memory
+otp_store = create_otp_store()
 
 @auth_bp.route('/send-otp', methods=['POST'])
 def send_otp():
@@ -22,11 +23,7 @@ def send_otp():
     otp = str(random.randint(100000, 999999))
     
     # Store OTP with expiry (5 minutes)
-    expiry_time = datetime.utcnow() + timedelta(minutes=int(os.getenv('OTP_EXPIRY_MINUTES', 5)))
-    otp_storage[phone_number] = {
-        'otp': otp,
-        'expiry': expiry_time
-    }
+    otp_store.put(phone_number, otp, int(os.getenv('OTP_EXPIRY_MINUTES', 5)) * 60)
     
     # In production, send OTP via SMS service
     # For demo purposes, we'll return the OTP (remove this in production)
@@ -45,23 +42,23 @@ def verify_otp():
         return jsonify({'error': 'Phone number and OTP are required'}), 400
     
     # Check if OTP exists and is valid
-    stored_otp_data = otp_storage.get(phone_number)
+    stored_otp_data = otp_store.get(phone_number)
     if not stored_otp_data:
         return jsonify({'error': 'OTP not found or expired'}), 400
     
-    if datetime.utcnow() > stored_otp_data['expiry']:
-        del otp_storage[phone_number]
+    if time.time() > stored_otp_data['expires_at']:
+        otp_store.delete(phone_number)
         return jsonify({'error': 'OTP expired'}), 400
     
     if stored_otp_data['otp'] != otp:
         return jsonify({'error': 'Invalid OTP'}), 400
     
-    # OTP is valid, create or get user
+    # OTP is valid, create or get user and stamp the login in one round trip
     is_admin = user_model.is_admin_phone(phone_number)
-    user_id = user_model.create_user(phone_number, is_admin)
+    user = user_model.login_user(phone_number, is_admin)
     
-    if user_id:
-        user_model.update_last_login(user_id)
+    if user:
+        user_id = str(user['_id'])
         
         # Store user session
         session['user_id'] = user_id
@@ -69,7 +66,7 @@ def verify_otp():
         session['is_admin'] = is_admin
         
         # Clean up OTP
-        del otp_storage[phone_number]
+        otp_store.delete(phone_number)
         
         return jsonify({
             'message': 'Login successful',
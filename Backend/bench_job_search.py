@@ -0,0 +1,128 @@
+"""Job search latency against a jobs collection of synthetic postings.
+
+Needs MONGODB_CONNECTION_STRING; postings are written to DATABASE_NAME
+(default easemyform_bench), whose jobs collection is dropped first.
+
+Usage: python src/bench_job_search.py [postings] [repeats]
+"""
+import os
+import sys
+import time
+import random
+import statistics
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+os.environ.setdefault('DATABASE_NAME', 'easemyform_bench')
+
+from src.database.connection import db_connection
+from src.database.indexes import ensure_indexes
+from src.models.job_model import JobModel, DEFAULT_JOB_FIELDS
+
+ROLES = ['Software Engineer', 'Data Analyst', 'Product Manager', 'Designer', 'DevOps Engineer',
+         'Data Scientist', 'QA Engineer', 'Sales Executive', 'HR Manager', 'Content Writer']
+LEVELS = ['Junior', 'Senior', 'Lead', 'Principal', 'Associate']
+COMPANIES = [f'Company {i}' for i in range(500)]
+LOCATIONS = ['Bangalore', 'Pune', 'Hyderabad', 'Mumbai', 'Delhi', 'Chennai', 'Remote', 'Indore']
+JOB_TYPES = ['Full-time', 'Part-time', 'Contract', 'Internship']
+SKILLS = ['python', 'java', 'react', 'kubernetes', 'sql', 'excel', 'figma', 'aws', 'django', 'flask',
+          'mongodb', 'tableau', 'selenium', 'negotiation', 'recruiting', 'seo', 'golang', 'spark']
+FILLER = 'we are hiring a motivated person to join our growing team and work on exciting products'.split()
+
+PAGE_SIZE = 20
+DEEP_OFFSET = 2500
+
+def make_job(i, now):
+    role = random.choice(ROLES)
+    words = random.sample(SKILLS, 4) + random.choices(FILLER, k=60)
+    random.shuffle(words)
+    return {
+        'title': f'{random.choice(LEVELS)} {role}',
+        'company': random.choice(COMPANIES),
+        'location': random.choice(LOCATIONS),
+        'description': ' '.join(words),
+        'requirements': random.sample(SKILLS, 3),
+        'salary_range': f'{random.randint(3, 30)}-{random.randint(31, 60)} LPA',
+        'job_type': random.choice(JOB_TYPES),
+        'status': 'active' if random.random() < 0.8 else 'closed',
+        'created_at': now - timedelta(minutes=i),
+        'updated_at': now - timedelta(minutes=i)
+    }
+
+def seed(db, postings):
+    db.jobs.drop()
+    now = datetime.utcnow()
+    for start in range(0, postings, 10000):
+        db.jobs.insert_many([make_job(i, now) for i in range(start, min(start + 10000, postings))], ordered=False)
+    failures = ensure_indexes(db)
+    if failures:
+        sys.exit(f"Index creation failed: {failures}")
+
+def timed(repeats, operation):
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        operation()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+def report(name, milliseconds):
+    print(f"{name:<44} {milliseconds:>10.2f} ms")
+
+def main():
+    postings = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    if not db_connection.connection_string:
+        sys.exit('Set MONGODB_CONNECTION_STRING to run this benchmark')
+    db = db_connection.get_database()
+    if db is None:
+        sys.exit('Could not connect to MongoDB')
+
+    started = time.perf_counter()
+    seed(db, postings)
+    print(f"Seeded {postings:,} postings into {db.name}.jobs in {time.perf_counter() - started:.1f}s\n")
+
+    jobs = JobModel()
+    projection = {field: 1 for field in DEFAULT_JOB_FIELDS}
+    active = {'status': ['active']}
+
+    # Keyset cursor for the page at DEEP_OFFSET, found once up front
+    deep = db.jobs.find({'status': 'active'}, {'created_at': 1}).sort([('created_at', -1), ('_id', -1)]).skip(DEEP_OFFSET - 1).limit(1)
+    deep = next(deep, None)
+    if deep is None:
+        sys.exit(f'Need more than {DEEP_OFFSET:,} active postings')
+    deep_cursor = (deep['created_at'], deep['_id'])
+
+    report('unbounded admin listing (before)', timed(max(repeats // 10, 1), lambda: list(
+        db.jobs.find({}, projection).sort('created_at', -1)
+    )))
+    report(f'skip/limit page at offset {DEEP_OFFSET:,}', timed(repeats, lambda: list(
+        db.jobs.find({'status': 'active'}, projection).sort([('created_at', -1), ('_id', -1)]).skip(DEEP_OFFSET).limit(PAGE_SIZE)
+    )))
+    report(f'keyset page at offset {DEEP_OFFSET:,}', timed(repeats, lambda: jobs.search(
+        None, active, PAGE_SIZE, deep_cursor
+    )))
+    report('first page, newest active', timed(repeats, lambda: jobs.search(None, active, PAGE_SIZE)))
+    report('first page, location + job_type', timed(repeats, lambda: jobs.search(
+        None, dict(active, location=['Pune'], job_type=['Contract']), PAGE_SIZE
+    )))
+    report('regex search "kubernetes" (before)', timed(repeats, lambda: list(
+        db.jobs.find({'status': 'active', '$or': [
+            {field: {'$regex': 'kubernetes', '$options': 'i'}} for field in ('title', 'company', 'description')
+        ]}, projection).sort('created_at', -1).limit(PAGE_SIZE)
+    )))
+    report('text search "kubernetes"', timed(repeats, lambda: jobs.search('kubernetes', active, PAGE_SIZE)))
+    report('text search "senior data scientist"', timed(repeats, lambda: jobs.search('senior data scientist', active, PAGE_SIZE)))
+
+    page, _ = jobs.search('senior data scientist', active, PAGE_SIZE)
+    last = page[-1]
+    report('text search, second page', timed(repeats, lambda: jobs.search(
+        'senior data scientist', active, PAGE_SIZE, (last['relevance'], last['_id'])
+    )))
+    report('text search "python" in Remote', timed(repeats, lambda: jobs.search(
+        'python', dict(active, location=['Remote']), PAGE_SIZE
+    )))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""Encoding time and response bytes for representative API payloads.
+
+Compares stock jsonify (with the per-field isoformat() the views used to
+do) against FastJSONProvider, then gzip/brotli at the levels used by
+compress_response.
+
+Usage: python src/bench_json_compression.py [iterations]
+"""
+import os
+import sys
+import time
+import gzip
+import random
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from bson import ObjectId
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from src.services.json_provider import FastJSONProvider, orjson
+from src.services.compression import brotli, COMPRESS_GZIP_LEVEL, COMPRESS_BROTLI_QUALITY
+from src.services.linkedin_scorer import review_profiles, detailed_feedback
+
+def _when(days):
+    return datetime.utcnow() - timedelta(days=days, seconds=random.randint(0, 86400))
+
+def admin_users(n=100):
+    return {'users': [{
+        'id': ObjectId(),
+        'phone_number': f'+91-{random.randint(6000000000, 9999999999)}',
+        'is_admin': False,
+        'created_at': _when(30),
+        'last_login': _when(1),
+        'ats_checks': random.randint(0, 40),
+        'linkedin_reviews': random.randint(0, 10)
+    } for _ in range(n)], 'pagination': {'limit': n, 'next_cursor': None, 'has_next': False}}
+
+def admin_jobs(n=500):
+    return {'jobs': [{
+        'id': ObjectId(),
+        'title': random.choice(['Backend Engineer', 'Data Analyst', 'Product Manager', 'Sales Executive']),
+        'company': random.choice(['Acme Corp', 'Globex', 'Initech', 'Umbrella']),
+        'location': random.choice(['Bengaluru', 'Pune', 'Remote', 'Hyderabad']),
+        'job_type': 'Full-time',
+        'salary_range': '10-15 LPA',
+        'status': 'active',
+        'created_at': _when(60)
+    } for _ in range(n)]}
+
+def admin_blogs(n=200):
+    return {'blogs': [{
+        'id': ObjectId(),
+        'title': f'How to write a resume that gets past ATS, part {i}',
+        'slug': f'ats-resume-part-{i}',
+        'excerpt': 'Recruiters spend seconds on each resume. Here is how to make them count. ' * 2,
+        'author': 'EaseMyForm Team',
+        'published': True,
+        'views': random.randint(0, 50000),
+        'likes': random.randint(0, 2000),
+        'created_at': _when(365)
+    } for i in range(n)]}
+
+def linkedin_premium():
+    review = review_profiles(['https://www.linkedin.com/in/example'], is_paid=True)[0]
+    return {
+        'overall_score': review['overall_score'],
+        'detailed_scores': review['detailed_scores'],
+        'detailed_feedback': detailed_feedback(review),
+        'recommendations': review['recommendations']
+    }
+
+def linkedin_bulk(n=1000):
+    urls = [f'https://www.linkedin.com/in/user-{i}' for i in range(n)]
+    return {'results': review_profiles(urls, is_paid=True), 'invalid': []}
+
+def with_isoformat(value):
+    """What the views had to do before: stringify ids and dates by hand"""
+    if isinstance(value, dict):
+        return {key: with_isoformat(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [with_isoformat(item) for item in value]
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    return value
+
+def timed(fn, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        result = fn()
+    return result, (time.perf_counter() - started) / iterations * 1e6
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    app = Flask('bench')
+    stock = DefaultJSONProvider(app)
+    fast = FastJSONProvider(app)
+    print(f"orjson: {'yes' if orjson else 'no (stdlib fallback)'}   brotli: {'yes' if brotli else 'no'}\n")
+
+    payloads = [
+        ('GET /api/admin/users', admin_users()),
+        ('GET /api/admin/jobs', admin_jobs()),
+        ('GET /api/admin/blogs', admin_blogs()),
+        ('POST /api/linkedin/review-premium', linkedin_premium()),
+        ('POST /api/linkedin/review-bulk', linkedin_bulk())
+    ]
+
+    print(f"{'endpoint':<36}{'stock us':>10}{'fast us':>10}{'raw B':>10}{'gzip B':>9}{'gzip us':>9}{'br B':>9}{'br us':>8}")
+    for name, payload in payloads:
+        with app.app_context():
+            _, stock_us = timed(lambda: stock.response(with_isoformat(payload)).get_data(), iterations)
+            body, fast_us = timed(lambda: fast.response(payload).get_data(), iterations)
+        gzipped, gzip_us = timed(lambda: gzip.compress(body, compresslevel=COMPRESS_GZIP_LEVEL, mtime=0), iterations)
+        if brotli:
+            brotlied, br_us = timed(lambda: brotli.compress(body, quality=COMPRESS_BROTLI_QUALITY), iterations)
+            br_columns = f"{len(brotlied):>9,}{br_us:>8,.0f}"
+        else:
+            br_columns = f"{'-':>9}{'-':>8}"
+        print(f"{name:<36}{stock_us:>10,.0f}{fast_us:>10,.0f}{len(body):>10,}{len(gzipped):>9,}{gzip_us:>9,.0f}{br_columns}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""Send/verify throughput of the OTP store backends.
+
+Usage: python src/bench_otp_store.py [operations] [processes]
+"""
+import os
+import sys
+import time
+import random
+import tempfile
+import multiprocessing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from src.services.otp_store import MemoryOTPStore, SQLiteOTPStore
+
+TTL_SECONDS = 300
+
+def run_cycle(store, operations, offset=0):
+    """send-otp then verify-otp for `operations` distinct phone numbers; returns (send_seconds, verify_seconds)"""
+    phones = [f'+91-{offset + i:010d}' for i in range(operations)]
+
+    started = time.perf_counter()
+    for phone in phones:
+        store.put(phone, str(random.randint(100000, 999999)), TTL_SECONDS)
+    send_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for phone in phones:
+        entry = store.get(phone)
+        if entry and time.time() <= entry['expires_at']:
+            store.delete(phone)
+    verify_seconds = time.perf_counter() - started
+
+    return send_seconds, verify_seconds
+
+def _sqlite_worker(path, operations, offset, results):
+    results.put(run_cycle(SQLiteOTPStore(path), operations, offset))
+
+def report(name, operations, send_seconds, verify_seconds):
+    print(f"{name:<28} send {operations / send_seconds:>10,.0f} ops/s   verify {operations / verify_seconds:>10,.0f} ops/s")
+
+def main():
+    operations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    report('memory', operations, *run_cycle(MemoryOTPStore(), operations))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'otp.db')
+        report('sqlite (1 process)', operations, *run_cycle(SQLiteOTPStore(path), operations))
+
+        # Several workers sharing one database file, as under gunicorn
+        per_process = operations // processes
+        results = multiprocessing.Queue()
+        workers = [
+            multiprocessing.Process(target=_sqlite_worker, args=(path, per_process, (i + 1) * operations, results))
+            for i in range(processes)
+        ]
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        timings = [results.get() for _ in workers]
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+        print(f"{f'sqlite ({processes} processes)':<28} send+verify {2 * per_process * processes / elapsed:>10,.0f} ops/s combined, "
+              f"slowest worker {max(send + verify for send, verify in timings):.2f}s")
+
+    # Size bound: unverified requests beyond the cap never grow the store
+    bounded = MemoryOTPStore(max_entries=1000)
+    for i in range(10000):
+        bounded.put(f'+91-{i:010d}', '123456', TTL_SECONDS)
+    print(f"memory store after 10,000 unverified sends with max_entries=1000: {len(bounded)} entries")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+from flask import Blueprint, request, jsonify
+from src.database.connection import db_connection
+from src.models.blog_model import BlogModel
+from src.services.counter_buffer import blog_counters
+from src.services.blog_index import blog_index
+
+blog_bp = Blueprint('blog', __name__)
+blog_model = BlogModel()
+
+BLOG_SEARCH_MAX_RESULTS = 50
+
+def post_response(post):
+    # Cached counts plus increments this process has not finished writing
+    counts = blog_counters.totals(post['_id'], post, ('views', 'likes'))
+    return {
+        'id': str(post['_id']),
+        'title': post.get('title'),
+        'slug': post.get('slug'),
+        'excerpt': post.get('excerpt'),
+        'author': post.get('author', 'EaseMyForm Team'),
+        'tags': post.get('tags', []),
+        'featured_image': post.get('featured_image'),
+        'content_html': post.get('content_html', ''),
+        'views': counts['views'],
+        'likes': counts['likes'],
+        'created_at': post.get('created_at'),
+        'updated_at': post.get('updated_at')
+    }
+
+@blog_bp.route('/posts/<slug>', methods=['GET'])
+def get_post(slug):
+    """Get a published blog post with its rendered HTML; counts a view"""
+    try:
+        post = blog_model.get_published_post(slug)
+    except Exception as e:
+        return jsonify({'error': f'Failed to fetch blog post: {str(e)}'}), 500
+
+    if post is None:
+        if db_connection.get_database() is None:
+            return jsonify({'error': 'Database connection failed'}), 500
+        return jsonify({'error': 'Blog post not found'}), 404
+
+    blog_counters.add(post['_id'], 'views')
+    return jsonify({'post': post_response(post)})
+
+@blog_bp.route('/posts/<slug>/like', methods=['POST'])
+def like_post(slug):
+    """Like a published blog post"""
+    try:
+        post = blog_model.get_published_post(slug)
+    except Exception as e:
+        return jsonify({'error': f'Failed to like blog post: {str(e)}'}), 500
+
+    if post is None:
+        if db_connection.get_database() is None:
+            return jsonify({'error': 'Database connection failed'}), 500
+        return jsonify({'error': 'Blog post not found'}), 404
+
+    blog_counters.add(post['_id'], 'likes')
+    return jsonify({'likes': post_response(post)['likes']})
+
+@blog_bp.route('/search', methods=['GET'])
+def search_posts():
+    """Search published blog posts by title, excerpt, content and tags"""
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'Search text is required'}), 400
+
+    try:
+        limit = min(max(int(request.args.get('limit', 10)), 1), BLOG_SEARCH_MAX_RESULTS)
+    except ValueError:
+        return jsonify({'error': 'Invalid limit'}), 400
+
+    blog_index.ensure_started()
+    if not blog_index.loaded:
+        return jsonify({'error': 'Search is starting up, please try again shortly'}), 503
+
+    return jsonify({'posts': blog_index.search(query, limit)})
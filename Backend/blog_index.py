@@ -0,0 +1,209 @@
+import os
+import re
+import math
+import heapq
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from src.database.connection import db_connection
+
+# Weight of a term occurrence by the field it appears in
+FIELD_WEIGHTS = {'title': 3.0, 'tags': 3.0, 'excerpt': 2.0, 'content': 1.0}
+# BM25 term-frequency saturation and length normalisation
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Each refresh re-reads posts updated this long before the previous one, to
+# cover other servers' clocks and writes still in flight; re-indexing is idempotent
+REFRESH_OVERLAP = timedelta(seconds=30)
+# Until the first load succeeds it is retried sooner, backing off up to the refresh interval
+LOAD_RETRY_INITIAL_SECONDS = 1.0
+
+STOPWORDS = frozenset(
+    'a an and are as at be but by for from has have in is it its of on or that the this to was were will with you your'.split()
+)
+TOKEN = re.compile(r'[a-z0-9]+')
+
+INDEXED_FIELDS = {'title': 1, 'slug': 1, 'excerpt': 1, 'content': 1, 'tags': 1, 'published': 1, 'created_at': 1, 'updated_at': 1}
+
+def tokenize(text):
+    return [token for token in TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+def _field_text(post, field):
+    value = post.get(field) or ''
+    return ' '.join(str(tag) for tag in value) if isinstance(value, list) else str(value)
+
+class BlogSearchIndex:
+    """Inverted index over published blog posts, ranked with BM25.
+
+    Term frequencies are weighted by field (FIELD_WEIGHTS), so a match in a
+    title counts for more than one in the body. Searches only read memory.
+    A background thread loads every published post, then picks up posts
+    written by other processes by their updated_at every refresh_interval
+    seconds; add_post/remove_post apply this process's own writes at once.
+    """
+
+    def __init__(self, refresh_interval=60.0):
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._reset()
+        self._thread = None
+        self._pid = None
+
+    def _reset(self):
+        # term -> {post_id: weighted term frequency}
+        self._postings = {}
+        # post_id -> {term: weighted term frequency}, to remove a post's postings
+        self._post_terms = {}
+        self._lengths = {}
+        self._total_length = 0.0
+        # post_id -> BM25 length normalisation; rebuilt by the first search after a change
+        self._norms = None
+        self._posts = {}
+        self._watermark = None
+        self.loaded = False
+
+    def ensure_started(self):
+        # Started on first use, and again after a fork, so every server process loads its own copy
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                if self._pid != os.getpid():
+                    self._reset()
+                self._thread = threading.Thread(target=self._run, name='blog-search-index', daemon=True)
+                self._pid = os.getpid()
+                self._thread.start()
+
+    def _run(self):
+        retry = LOAD_RETRY_INITIAL_SECONDS
+        while True:
+            try:
+                if self.loaded:
+                    self.refresh()
+                else:
+                    self.build()
+            except Exception as e:
+                logging.error(f"Blog search index {'refresh' if self.loaded else 'load'} failed: {e}")
+            if self.loaded:
+                time.sleep(self.refresh_interval)
+            else:
+                time.sleep(retry)
+                retry = min(retry * 2, self.refresh_interval)
+
+    def build(self):
+        """Index every published post; returns the number indexed"""
+        db = db_connection.get_database()
+        if db is None:
+            raise RuntimeError('Database connection failed')
+
+        started_at = datetime.utcnow()
+        posts = list(db.blog_posts.find({'published': True}, INDEXED_FIELDS))
+        with self._lock:
+            for post in posts:
+                self._add(post)
+            self._watermark = started_at
+            self.loaded = True
+        logging.info(f"Blog search index: {len(posts)} posts")
+        return len(posts)
+
+    def refresh(self):
+        """Apply posts created, edited, unpublished or deleted since the last load or refresh"""
+        db = db_connection.get_database()
+        if db is None:
+            return 0
+
+        started_at = datetime.utcnow()
+        with self._lock:
+            # Posts this process indexes while the queries run are not in `published` yet
+            known = set(self._posts)
+        changed = list(db.blog_posts.find({'updated_at': {'$gte': self._watermark - REFRESH_OVERLAP}}, INDEXED_FIELDS))
+        published = {post['_id'] for post in db.blog_posts.find({'published': True}, {'_id': 1})}
+        with self._lock:
+            for post in changed:
+                self._add(post)
+            for post_id in known - published:
+                self._remove(post_id)
+            self._watermark = started_at
+        return len(changed)
+
+    def add_post(self, post):
+        """Index a post that was just created or updated; unpublished posts are dropped"""
+        with self._lock:
+            self._add(post)
+
+    def remove_post(self, post_id):
+        with self._lock:
+            self._remove(post_id)
+
+    def _add(self, post):
+        post_id = post['_id']
+        self._remove(post_id)
+        self._norms = None
+        if not post.get('published'):
+            return
+
+        frequencies = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            for term in tokenize(_field_text(post, field)):
+                frequencies[term] = frequencies.get(term, 0.0) + weight
+
+        for term, frequency in frequencies.items():
+            self._postings.setdefault(term, {})[post_id] = frequency
+        self._post_terms[post_id] = frequencies
+        self._lengths[post_id] = sum(frequencies.values())
+        self._total_length += self._lengths[post_id]
+        self._posts[post_id] = {
+            'id': str(post_id),
+            'slug': post.get('slug'),
+            'title': post.get('title'),
+            'excerpt': post.get('excerpt'),
+            'tags': post.get('tags', []),
+            'created_at': post.get('created_at')
+        }
+
+    def _remove(self, post_id):
+        frequencies = self._post_terms.pop(post_id, None)
+        if frequencies is None:
+            return
+        self._norms = None
+        for term in frequencies:
+            postings = self._postings[term]
+            del postings[post_id]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(post_id)
+        del self._posts[post_id]
+
+    def search(self, query, limit=10):
+        """Best-matching posts for query, highest BM25 score first"""
+        terms = set(tokenize(query))
+        with self._lock:
+            count = len(self._posts)
+            if not terms or not count:
+                return []
+
+            if self._norms is None:
+                average_length = self._total_length / count or 1.0
+                self._norms = {
+                    post_id: BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+                    for post_id, length in self._lengths.items()
+                }
+            norms = self._norms
+
+            scores = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                weight = (BM25_K1 + 1) * math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for post_id, frequency in postings.items():
+                    scores[post_id] = scores.get(post_id, 0.0) + weight * frequency / (frequency + norms[post_id])
+
+            best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+            return [dict(self._posts[post_id], score=round(score, 4)) for post_id, score in best]
+
+    def stats(self):
+        with self._lock:
+            return {'loaded': self.loaded, 'posts': len(self._posts), 'terms': len(self._postings)}
+
+# Global blog search index, one per server process
+blog_index = BlogSearchIndex(refresh_interval=float(os.getenv('BLOG_INDEX_REFRESH_SECONDS', 60)))
@@ -0,0 +1,90 @@
+from src.database.connection import db_connection
+from src.services.blog_renderer import render_content, RENDER_VERSION
+from src.services.cache import TTLCache
+from src.services.counter_buffer import blog_counters
+import os
+import time
+import weakref
+
+# Published posts are served from memory for this long per process
+blog_cache = TTLCache(
+    'blog_posts',
+    max_entries=int(os.getenv('BLOG_CACHE_MAX_ENTRIES', 1000)),
+    max_bytes=int(os.getenv('BLOG_CACHE_MAX_BYTES', 32 * 1024 * 1024)),
+    ttl_seconds=int(os.getenv('BLOG_CACHE_TTL_SECONDS', 300))
+)
+
+# The raw content is never sent to readers; content_html is
+PUBLIC_POST_FIELDS = {
+    'title': 1, 'slug': 1, 'excerpt': 1, 'author': 1, 'tags': 1, 'featured_image': 1,
+    'content_html': 1, 'render_version': 1, 'views': 1, 'likes': 1, 'created_at': 1, 'updated_at': 1
+}
+
+class CachedPost(dict):
+    """A post as read for the cache; loaded_at is the time.monotonic() just after the read"""
+    __slots__ = ('loaded_at', '__weakref__')
+
+# post _id -> cached post, for applying flushed counters. Weak, so a post
+# leaves it as soon as blog_cache evicts or expires it.
+_loaded_posts = weakref.WeakValueDictionary()
+
+def _apply_flushed_counts(written, started_at):
+    """Move flushed view/like increments into the cached posts they were counted against"""
+    for post_id, counters in written.items():
+        post = _loaded_posts.get(post_id)
+        if post is None:
+            continue
+        if post.loaded_at < started_at:
+            for field, amount in counters.items():
+                post[field] = post.get(field, 0) + amount
+        else:
+            # Read while the write was running, so it may already include these increments
+            blog_cache.delete(post['slug'])
+            _loaded_posts.pop(post_id, None)
+
+blog_counters.on_flush(_apply_flushed_counts)
+
+class BlogModel:
+    @property
+    def db(self):
+        return db_connection.get_database()
+
+    @property
+    def collection(self):
+        db = self.db
+        return db.blog_posts if db is not None else None
+
+    def prepare_post(self, post):
+        """Fill in the fields derived from a post's content before it is written"""
+        post['content_html'] = render_content(post.get('content'))
+        post['render_version'] = RENDER_VERSION
+        return post
+
+    def get_published_post(self, slug):
+        """A published post by slug, from the in-process cache when possible"""
+        return blog_cache.get_or_compute(slug, lambda: self._load_published_post(slug))
+
+    def _load_published_post(self, slug):
+        if self.collection is None:
+            return None
+
+        post = self.collection.find_one({'slug': slug, 'published': True}, PUBLIC_POST_FIELDS)
+        if post is None:
+            return None
+        post = CachedPost(post)
+        post.loaded_at = time.monotonic()
+
+        if post.get('render_version') != RENDER_VERSION:
+            # Never rendered, or rendered without the current sanitising; render it now and keep the result
+            stored = self.collection.find_one({'_id': post['_id']}, {'content': 1})
+            if stored is None:
+                # Deleted since the first read
+                return None
+            post['content_html'] = render_content(stored.get('content'))
+            post['render_version'] = RENDER_VERSION
+            self.collection.update_one(
+                {'_id': post['_id']},
+                {'$set': {'content_html': post['content_html'], 'render_version': RENDER_VERSION}}
+            )
+        _loaded_posts[post['_id']] = post
+        return post
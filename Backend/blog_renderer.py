@@ -0,0 +1,46 @@
+import re
+import html
+import markdown
+from markdown.util import AMP_SUBSTITUTE
+from markdown.treeprocessors import Treeprocessor
+
+MARKDOWN_EXTENSIONS = ['extra', 'sane_lists']
+# Stored with each post's content_html; posts rendered by an older version are re-rendered when read
+RENDER_VERSION = 3
+# Link and image targets may be relative or use one of these schemes
+SAFE_URL_SCHEMES = ('http', 'https', 'mailto')
+URL_ATTRIBUTES = ('href', 'src')
+URL_SCHEME = re.compile(r'^([a-z][a-z0-9+.-]*):', re.IGNORECASE)
+# Browsers ignore these inside a scheme, so "java\tscript:" still runs
+IGNORED_URL_CHARS = re.compile(r'[\x00-\x20\x7f]')
+
+def _safe_url(url):
+    # Check the URL the browser will see: entities such as &#106; are decoded before the scheme is read
+    url = html.unescape(url.replace(AMP_SUBSTITUTE, '&'))
+    scheme = URL_SCHEME.match(IGNORED_URL_CHARS.sub('', url))
+    return scheme is None or scheme.group(1).lower() in SAFE_URL_SCHEMES
+
+class _SanitiseAttributes(Treeprocessor):
+    """Drop event handler attributes (attr_list allows any) and script URLs"""
+
+    def run(self, root):
+        for element in root.iter():
+            for name in list(element.attrib):
+                lowered = name.lower()
+                if lowered.startswith('on') or (lowered in URL_ATTRIBUTES and not _safe_url(element.attrib[name])):
+                    del element.attrib[name]
+
+def render_content(content):
+    """HTML for a blog post body, rendered once when the post is written.
+
+    Content is Markdown. Raw HTML in it is escaped rather than passed
+    through, and links or images with a scheme other than SAFE_URL_SCHEMES
+    lose their target.
+    """
+    if not content:
+        return ''
+    renderer = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS, output_format='html')
+    renderer.preprocessors.deregister('html_block')
+    renderer.inlinePatterns.deregister('html')
+    renderer.treeprocessors.register(_SanitiseAttributes(renderer), 'sanitise_attributes', 0)
+    return renderer.convert(content)
@@ -0,0 +1,144 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+# Every named cache registers here so its counters can be reported
+_registry = {}
+_registry_lock = threading.Lock()
+
+def _estimate_size(value):
+    return len(json.dumps(value, default=str))
+
+class TTLCache:
+    """Thread-safe LRU cache with per-entry expiry and a memory ceiling"""
+
+    def __init__(self, name, max_entries=1024, max_bytes=16 * 1024 * 1024, ttl_seconds=3600):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.coalesced = 0
+        # key -> lock held while one caller computes a missing value
+        self._inflight = {}
+
+        with _registry_lock:
+            _registry[name] = self
+
+    def _remove(self, key):
+        _, _, size = self._entries.pop(key)
+        self.current_bytes -= size
+
+    def _lookup(self, key, default):
+        # Caller holds self._lock; returns (value, found)
+        entry = self._entries.get(key)
+        if entry is None:
+            return default, False
+
+        value, expires_at, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            return default, False
+
+        self._entries.move_to_end(key)
+        return value, True
+
+    def get(self, key, default=None):
+        with self._lock:
+            value, found = self._lookup(key, default)
+            if found:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return value
+
+    def get_or_compute(self, key, compute):
+        """Cached value for key, computing and caching it on a miss.
+
+        A None result is returned but not cached. Concurrent misses for the same key wait for a single compute() call
+        instead of each running their own.
+        """
+        with self._lock:
+            value, found = self._lookup(key, None)
+            if found:
+                self.hits += 1
+                return value
+            self.misses += 1
+            flight = self._inflight.setdefault(key, threading.Lock())
+
+        with flight:
+            with self._lock:
+                value, found = self._lookup(key, None)
+                if found:
+                    self.coalesced += 1
+                    return value
+            try:
+                value = compute()
+                if value is not None:
+                    self.set(key, value)
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+            return value
+
+    def set(self, key, value):
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return False
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds, size)
+            self.current_bytes += size
+
+            # Evict least recently used entries until both limits hold
+            while len(self._entries) > self.max_entries or self.current_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+                return True
+            return False
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'coalesced': self.coalesced
+            }
+
+def cache_stats():
+    """Counters for every cache in this process"""
+    with _registry_lock:
+        caches = list(_registry.items())
+    return {name: cache.stats() for name, cache in caches}
@@ -1,56 +1,139 @@
 import os
+import time
+import threading
+import pymongo
 from pymongo import MongoClient
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
 import logging
 
+# How often the background checker pings the server, and how long a ping may take
+HEALTH_CHECK_INTERVAL_SECONDS = float(os.getenv('DB_HEALTH_CHECK_SECONDS', 5))
+HEALTH_CHECK_TIMEOUT_SECONDS = float(os.getenv('DB_HEALTH_CHECK_TIMEOUT_SECONDS', 2))
+# Consecutive failed pings before requests stop being handed a database
+FAILURE_THRESHOLD = int(os.getenv('DB_FAILURE_THRESHOLD', 2))
+
 class DatabaseConnection:
+    """One MongoClient per process, created on first use, behind a circuit breaker.
+
+    A background thread pings the server. After FAILURE_THRESHOLD failed
+    pings the circuit opens ('unavailable') and get_database() returns None
+    immediately, so callers take their "database unavailable" path instead
+    of waiting on server selection. The next successful ping closes it.
+    """
+
     def __init__(self):
         self.client = None
         self.db = None
         self.connection_string = os.getenv('MONGODB_CONNECTION_STRING')
         self.database_name = os.getenv('DATABASE_NAME', 'easemyform')
-        
+        self.state = 'disconnected'
+        self.failures = 0
+        self.last_error = None
+        self.last_checked_at = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._on_connect = []
+        self._connected_once = False
+
     def connect(self):
-        try:
+        """Create this process's client and run a first health check; returns True if the server answered"""
+        with self._lock:
+            if self._pid == os.getpid() and self.client is not None:
+                return self.state == 'connected'
+
             if not self.connection_string:
                 logging.warning("MongoDB connection string not found, using default settings")
+                self._pid = os.getpid()
                 return False
-                
+
+            # A client inherited through fork must not be used; start over in this process
             self.client = MongoClient(
                 self.connection_string,
                 serverSelectionTimeoutMS=5000,
                 connectTimeoutMS=10000,
                 socketTimeoutMS=20000,
                 maxPoolSize=50,
-                retryWrites=True
+                retryWrites=True,
+                connect=False
             )
-            
-            # Test the connection
-            self.client.admin.command('ping')
             self.db = self.client[self.database_name]
-            logging.info("Successfully connected to MongoDB Atlas")
-            return True
-            
-        except ConnectionFailure as e:
-            logging.error(f"Failed to connect to MongoDB: {e}")
-            return False
-        except ServerSelectionTimeoutError as e:
-            logging.error(f"Server selection timeout: {e}")
-            return False
+            self._pid = os.getpid()
+            self._connected_once = False
+            self.failures = 0
+            self.state = 'connecting'
+            self._stop = threading.Event()
+
+        self.check_health()
+        threading.Thread(target=self._run_health_checks, args=(self._stop,), name='mongodb-health', daemon=True).start()
+        return self.state == 'connected'
+
+    def check_health(self):
+        """Ping the server once and update the circuit"""
+        try:
+            with pymongo.timeout(HEALTH_CHECK_TIMEOUT_SECONDS):
+                self.client.admin.command('ping')
+        except (ConnectionFailure, ServerSelectionTimeoutError) as e:
+            self._record_failure(e)
         except Exception as e:
-            logging.error(f"Unexpected error connecting to MongoDB: {e}")
-            return False
-    
+            logging.error(f"Unexpected error pinging MongoDB: {e}")
+            self._record_failure(e)
+        else:
+            self._record_success()
+        self.last_checked_at = time.time()
+
+    def _record_failure(self, error):
+        self.failures += 1
+        self.last_error = str(error)
+        if self.state != 'unavailable' and (self.failures >= FAILURE_THRESHOLD or self.state == 'connecting'):
+            logging.error(f"MongoDB unavailable, failing database calls fast: {error}")
+            self.state = 'unavailable'
+
+    def _record_success(self):
+        if self.state != 'connected':
+            logging.info("Successfully connected to MongoDB Atlas")
+        self.failures = 0
+        self.last_error = None
+        self.state = 'connected'
+        if not self._connected_once:
+            self._connected_once = True
+            threading.Thread(target=self._run_on_connect, args=(self.db,), name='mongodb-on-connect', daemon=True).start()
+
+    def _run_on_connect(self, db):
+        for callback in self._on_connect:
+            try:
+                callback(db)
+            except Exception as e:
+                logging.error(f"MongoDB on-connect task failed: {e}")
+
+    def _run_health_checks(self, stop):
+        while not stop.wait(HEALTH_CHECK_INTERVAL_SECONDS):
+            self.check_health()
+
+    def on_connect(self, callback):
+        """Run callback(db) the first time each process reaches the server"""
+        self._on_connect.append(callback)
+
     def get_database(self):
-        if self.db is None:
+        if self._pid != os.getpid():
             self.connect()
+        if self.state == 'unavailable':
+            return None
         return self.db
-    
+
+    def status(self):
+        return {
+            'state': self.state,
+            'consecutive_failures': self.failures,
+            'last_error': self.last_error,
+            'last_checked_at': self.last_checked_at
+        }
+
     def close_connection(self):
+        self._stop.set()
         if self.client:
             self.client.close()
             logging.info("MongoDB connection closed")
 
 # Global database instance
 db_connection = DatabaseConnection()
-
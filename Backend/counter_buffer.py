@@ -0,0 +1,143 @@
+import os
+import atexit
+import logging
+import threading
+import time
+from pymongo import UpdateOne
+from src.database.connection import db_connection
+
+class CounterBuffer:
+    """In-memory increments for per-document counters, flushed in bulk.
+
+    add() only touches a dict; a background thread writes everything
+    accumulated with one bulk_write of $inc updates every flush_interval
+    seconds. Increments from a failed flush are put back for the next one.
+    Increments stay visible through totals() while they are being written,
+    and on_flush callbacks move them into cached copies of the documents
+    before they stop counting as pending.
+    """
+
+    def __init__(self, collection_name, flush_interval=5.0):
+        self.collection_name = collection_name
+        self.flush_interval = flush_interval
+        self._pending = {}
+        # Increments taken by the flush in progress
+        self._writing = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._on_flush = []
+        self._thread = None
+        self._stop = None
+        self._pid = None
+        self._flushes = 0
+        self._flushed = 0
+        self._failed_flushes = 0
+
+    def _ensure_started(self):
+        # Started on first use, and again after a fork, so every server process owns its own thread
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                if self._pid != os.getpid():
+                    # Increments inherited from the parent are the parent's to write
+                    self._pending = {}
+                self._stop = threading.Event()
+                self._thread = threading.Thread(
+                    target=self._run, args=(self._stop,), name=f'{self.collection_name}-counters', daemon=True
+                )
+                self._pid = os.getpid()
+                self._thread.start()
+
+    def add(self, document_id, field, amount=1):
+        self._ensure_started()
+        with self._lock:
+            counters = self._pending.setdefault(document_id, {})
+            counters[field] = counters.get(field, 0) + amount
+
+    def on_flush(self, callback):
+        """Run callback(written, started_at) after each successful flush, before the written increments stop counting in totals().
+
+        written maps document ids to the increments written; started_at is
+        the time.monotonic() at which the write began.
+        """
+        self._on_flush.append(callback)
+
+    def totals(self, document_id, document, fields):
+        """document's values for fields plus the increments this process has not finished writing"""
+        with self._lock:
+            totals = {field: document.get(field, 0) for field in fields}
+            if self._pid == os.getpid():
+                for counters in (self._pending.get(document_id), self._writing.get(document_id)):
+                    for field, amount in (counters or {}).items():
+                        if field in totals:
+                            totals[field] += amount
+            return totals
+
+    def _run(self, stop):
+        while not stop.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """Write everything accumulated so far; returns the number of documents updated"""
+        with self._flush_lock:
+            return self._flush()
+
+    def _flush(self):
+        with self._lock:
+            if self._pid != os.getpid() or not self._pending:
+                return 0
+            pending, self._pending = self._pending, {}
+            self._writing = pending
+
+        db = db_connection.get_database()
+        started_at = time.monotonic()
+        try:
+            if db is None:
+                raise RuntimeError('Database connection failed')
+            db[self.collection_name].bulk_write(
+                [UpdateOne({'_id': document_id}, {'$inc': counters}) for document_id, counters in pending.items()],
+                ordered=False
+            )
+        except Exception as e:
+            logging.error(f"Failed to flush {len(pending)} {self.collection_name} counters: {e}")
+            self._failed_flushes += 1
+            with self._lock:
+                for document_id, counters in pending.items():
+                    merged = self._pending.setdefault(document_id, {})
+                    for field, amount in counters.items():
+                        merged[field] = merged.get(field, 0) + amount
+                self._writing = {}
+            return 0
+
+        with self._lock:
+            for callback in self._on_flush:
+                try:
+                    callback(pending, started_at)
+                except Exception as e:
+                    logging.error(f"{self.collection_name} counter flush callback failed: {e}")
+            self._writing = {}
+        self._flushes += 1
+        self._flushed += len(pending)
+        return len(pending)
+
+    def stop(self):
+        """Stop the flush thread and write what is left"""
+        with self._lock:
+            stop = self._stop if self._pid == os.getpid() else None
+            self._thread = None
+        if stop is not None:
+            stop.set()
+            self.flush()
+
+    def stats(self):
+        with self._lock:
+            pending = len(self._pending) if self._pid == os.getpid() else 0
+        return {
+            'pending_documents': pending,
+            'flushes': self._flushes,
+            'flushed_documents': self._flushed,
+            'failed_flushes': self._failed_flushes
+        }
+
+# View and like counts for blog posts
+blog_counters = CounterBuffer('blog_posts', flush_interval=float(os.getenv('BLOG_COUNTER_FLUSH_SECONDS', 5.0)))
+atexit.register(blog_counters.stop)
@@ -0,0 +1,82 @@
+import io
+import re
+import csv
+import json
+from datetime import date, datetime
+
+# Rows written before a chunk of the response body is yielded
+CHUNK_ROWS = 500
+# Leading characters that make spreadsheet applications evaluate a cell as a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+# Phone numbers and signed numbers start with + or - but cannot call a function, so they are left as they are
+PLAIN_NUMBER = re.compile(r'[+-][0-9][0-9 ().-]*')
+
+def ndjson_stream(documents, dumps):
+    """NDJSON response body: one document per line, yielded CHUNK_ROWS lines at a time"""
+    lines = []
+    for document in documents:
+        lines.append(dumps(document))
+        if len(lines) >= CHUNK_ROWS:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+def csv_cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, list):
+        value = '; '.join(str(item) for item in value)
+    value = str(value)
+    # Quote anything else a spreadsheet would evaluate, such as =HYPERLINK(...) or -2+cmd|...
+    if value.startswith(FORMULA_PREFIXES) and not PLAIN_NUMBER.fullmatch(value):
+        return "'" + value
+    return value
+
+def csv_stream(rows, columns):
+    """CSV response body with a header row, yielded CHUNK_ROWS rows at a time"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for count, row in enumerate(rows, 1):
+        writer.writerow([csv_cell(row.get(column)) for column in columns])
+        if count % CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+def read_ndjson(stream):
+    """(line_number, object, error) for each non-blank line of a binary NDJSON stream"""
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield line_number, json.loads(line), None
+        except ValueError as e:
+            yield line_number, None, f'Invalid JSON: {e}'
+
+def read_csv(stream):
+    """(row_number, row, error) for each data row of a binary CSV stream with a header row"""
+    # Undecodable bytes become U+FFFD, so they fail their own row rather than ending the read
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', errors='replace', newline='')
+    try:
+        reader = csv.DictReader(text)
+        for row in reader:
+            # Numbered by line, as a spreadsheet shows them
+            if None in row:
+                yield reader.line_num, None, 'More values than header columns'
+            elif any(value and '\ufffd' in value for value in row.values()):
+                yield reader.line_num, None, 'Not valid UTF-8'
+            else:
+                yield reader.line_num, row, None
+    except csv.Error as e:
+        # The reader cannot resume after this, so nothing past this row was read
+        yield reader.line_num, None, f'Unreadable CSV: {e}; this row and the rest of the file were not processed'
+    finally:
+        text.detach()
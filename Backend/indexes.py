@@ -0,0 +1,101 @@
+import os
+import logging
+from datetime import datetime
+from bson import ObjectId
+from pymongo import IndexModel, ASCENDING, DESCENDING, TEXT
+from pymongo.errors import OperationFailure, PyMongoError
+
+# Every index the application relies on, by collection. Names are left to
+# MongoDB's defaults so re-applying the registry is a no-op.
+INDEXES = {
+    'users': [
+        IndexModel([('phone_number', ASCENDING)], unique=True),
+        IndexModel([('created_at', DESCENDING), ('_id', DESCENDING)])
+    ],
+    'ats_scores': [
+        IndexModel([('user_id', ASCENDING), ('timestamp', DESCENDING)]),
+        # Daily rollups re-read recent scores by time alone
+        IndexModel([('timestamp', DESCENDING)])
+    ],
+    'linkedin_scores': [
+        IndexModel([('user_id', ASCENDING), ('timestamp', DESCENDING)]),
+        IndexModel([('timestamp', DESCENDING)])
+    ],
+    'jobs': [
+        IndexModel([('created_at', DESCENDING)]),
+        # Job search: one text index per collection, plus newest-first listings per filter
+        IndexModel(
+            [('title', TEXT), ('company', TEXT), ('description', TEXT)],
+            weights={'title': 10, 'company': 5, 'description': 1}
+        ),
+        IndexModel([('status', ASCENDING), ('created_at', DESCENDING), ('_id', DESCENDING)]),
+        IndexModel([('status', ASCENDING), ('location', ASCENDING), ('created_at', DESCENDING), ('_id', DESCENDING)]),
+        IndexModel([('status', ASCENDING), ('job_type', ASCENDING), ('created_at', DESCENDING), ('_id', DESCENDING)])
+    ],
+    'blog_posts': [
+        IndexModel([('slug', ASCENDING)], unique=True),
+        IndexModel([('created_at', DESCENDING)]),
+        # Blog search index: loads and published-id sweeps, and refreshes by updated_at
+        IndexModel([('published', ASCENDING)]),
+        IndexModel([('updated_at', ASCENDING)])
+    ],
+    'ats_jobs': [
+        # Job results are only kept long enough to be polled
+        IndexModel([('created_at', ASCENDING)], expireAfterSeconds=int(os.getenv('ATS_JOB_TTL_SECONDS', 3600)))
+    ]
+}
+
+def _checked_queries():
+    """Representative queries from the models and routes, by collection"""
+    now = datetime.utcnow()
+    return [
+        ('users', 'find_user_by_phone', lambda c: c.find({'phone_number': '+91-0000000000'})),
+        ('users', 'admin users page', lambda c: c.find({'created_at': {'$type': 'date'}}).sort([('created_at', DESCENDING), ('_id', DESCENDING)]).limit(20)),
+        ('users', 'recent users count', lambda c: c.find({'created_at': {'$gte': now}})),
+        ('ats_scores', 'ATS history page', lambda c: c.find({'user_id': ObjectId(), 'timestamp': {'$lt': now}}).sort('timestamp', DESCENDING).limit(21)),
+        ('linkedin_scores', 'LinkedIn history page', lambda c: c.find({'user_id': ObjectId(), 'timestamp': {'$lt': now}}).sort('timestamp', DESCENDING).limit(21)),
+        ('ats_scores', 'ATS rollup refresh', lambda c: c.find({'timestamp': {'$gte': now}})),
+        ('linkedin_scores', 'LinkedIn rollup refresh', lambda c: c.find({'timestamp': {'$gte': now}})),
+        ('jobs', 'admin jobs list', lambda c: c.find({}).sort('created_at', DESCENDING)),
+        ('jobs', 'job search listing', lambda c: c.find({'status': 'active', 'location': 'Remote'}).sort([('created_at', DESCENDING), ('_id', DESCENDING)]).limit(21)),
+        ('jobs', 'job text search', lambda c: c.find({'$text': {'$search': 'python'}, 'status': 'active'})),
+        ('blog_posts', 'admin blogs list', lambda c: c.find({}).sort('created_at', DESCENDING)),
+        ('blog_posts', 'blog by slug', lambda c: c.find({'slug': 'example'})),
+        ('blog_posts', 'blog search published ids', lambda c: c.find({'published': True}, {'_id': 1})),
+        ('blog_posts', 'blog search refresh', lambda c: c.find({'updated_at': {'$gte': now}}))
+    ]
+
+def ensure_indexes(db):
+    """Create any missing indexes from the registry; returns a list of failures"""
+    failures = []
+    for collection_name, indexes in INDEXES.items():
+        try:
+            db[collection_name].create_indexes(indexes)
+        except PyMongoError as e:
+            # Most often duplicate values blocking a unique index; the other collections still get theirs
+            logging.error(f"Failed to create indexes on {collection_name}: {e}")
+            failures.append({'collection': collection_name, 'error': str(e)})
+    return failures
+
+def _plan_stages(plan):
+    if isinstance(plan, dict):
+        if 'stage' in plan:
+            yield plan['stage']
+        for value in plan.values():
+            yield from _plan_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _plan_stages(item)
+
+def find_collection_scans(db):
+    """Explain each representative query and return the ones whose plan is a COLLSCAN"""
+    scans = []
+    for collection_name, description, build_query in _checked_queries():
+        try:
+            plan = build_query(db[collection_name]).explain().get('queryPlanner', {}).get('winningPlan', {})
+        except OperationFailure as e:
+            logging.error(f"Could not explain '{description}': {e}")
+            continue
+        if 'COLLSCAN' in set(_plan_stages(plan)):
+            scans.append({'collection': collection_name, 'query': description})
+    return scans
@@ -0,0 +1,177 @@
+from src.database.connection import db_connection
+from pymongo.errors import BulkWriteError
+from datetime import datetime
+import os
+
+JOBS_PAGE_SIZE = int(os.getenv('JOBS_PAGE_SIZE', 20))
+JOBS_MAX_PAGE_SIZE = int(os.getenv('JOBS_MAX_PAGE_SIZE', 50))
+
+FILTER_FIELDS = ('location', 'job_type', 'status')
+# Fields a search may ask for; description and requirements are only sent when requested
+JOB_FIELDS = ('title', 'company', 'location', 'job_type', 'salary_range', 'status', 'created_at', 'description', 'requirements')
+DEFAULT_JOB_FIELDS = ('title', 'company', 'location', 'job_type', 'salary_range', 'status', 'created_at')
+
+# Longest value accepted for each imported text field
+IMPORT_FIELD_LIMITS = {
+    'title': 200, 'company': 200, 'location': 200, 'salary_range': 100,
+    'job_type': 50, 'status': 50, 'description': 20000
+}
+IMPORT_REQUIRED_FIELDS = ('title', 'company', 'location')
+MAX_REQUIREMENTS = 50
+
+def validate_job(row):
+    """Job fields from one imported row; returns (fields, None) or (None, error)"""
+    if not isinstance(row, dict):
+        return None, 'Row must be an object'
+
+    job = {}
+    for field, limit in IMPORT_FIELD_LIMITS.items():
+        value = row.get(field)
+        if value is None or value == '':
+            continue
+        if not isinstance(value, str):
+            return None, f'{field} must be a string'
+        value = value.strip()
+        if len(value) > limit:
+            return None, f'{field} is longer than {limit} characters'
+        if value:
+            job[field] = value
+
+    missing = [field for field in IMPORT_REQUIRED_FIELDS if field not in job]
+    if missing:
+        return None, f"Missing {', '.join(missing)}"
+
+    requirements = row.get('requirements') or []
+    if isinstance(requirements, str):
+        # CSV rows separate requirements with semicolons
+        requirements = requirements.split(';')
+    if not isinstance(requirements, list) or not all(isinstance(item, str) for item in requirements):
+        return None, 'requirements must be a list of strings'
+    requirements = [item.strip() for item in requirements if item.strip()]
+    if len(requirements) > MAX_REQUIREMENTS:
+        return None, f'At most {MAX_REQUIREMENTS} requirements'
+    job['requirements'] = requirements
+
+    job.setdefault('job_type', 'Full-time')
+    job.setdefault('status', 'active')
+    return job, None
+
+class JobModel:
+    @property
+    def db(self):
+        return db_connection.get_database()
+
+    @property
+    def collection(self):
+        db = self.db
+        return db.jobs if db is not None else None
+
+    def search(self, text=None, filters=None, limit=JOBS_PAGE_SIZE, after=None, fields=DEFAULT_JOB_FIELDS):
+        """One page of matching jobs; returns (jobs, has_more).
+
+        Without `text` jobs come newest first and `after` is a (created_at, _id)
+        cursor; jobs without a created_at date cannot be paged that way and
+        are left out. With `text` they are ranked by the text index and `after` is a
+        (relevance, _id) cursor; each job then carries its `relevance`.
+        filters maps a FILTER_FIELDS name to a list of accepted values.
+        """
+        if self.collection is None:
+            return [], False
+
+        match = {}
+        for field, values in (filters or {}).items():
+            match[field] = values[0] if len(values) == 1 else {'$in': values}
+        projection = {field: 1 for field in fields}
+        projection['created_at'] = 1
+
+        if text:
+            match['$text'] = {'$search': text}
+            pipeline = [
+                {'$match': match},
+                {'$addFields': {'relevance': {'$meta': 'textScore'}}}
+            ]
+            if after is not None:
+                relevance, job_id = after
+                pipeline.append({'$match': {'$or': [
+                    {'relevance': {'$lt': relevance}},
+                    {'relevance': relevance, '_id': {'$lt': job_id}}
+                ]}})
+            projection['relevance'] = 1
+            pipeline += [
+                {'$sort': {'relevance': -1, '_id': -1}},
+                {'$limit': limit + 1},
+                {'$project': projection}
+            ]
+            jobs = list(self.collection.aggregate(pipeline))
+        else:
+            match['created_at'] = {'$type': 'date'}
+            if after is not None:
+                created_at, job_id = after
+                match = {'$and': [match, {'$or': [
+                    {'created_at': {'$lt': created_at}},
+                    {'created_at': created_at, '_id': {'$lt': job_id}}
+                ]}]}
+            jobs = list(
+                self.collection.find(match, projection).sort([('created_at', -1), ('_id', -1)]).limit(limit + 1)
+            )
+
+        return jobs[:limit], len(jobs) > limit
+
+    def iter_jobs(self, batch_size=500):
+        """Every job posting in insertion order, read batch_size at a time"""
+        if self.collection is None:
+            return iter(())
+        fields = dict({field: 1 for field in JOB_FIELDS}, updated_at=1)
+        return self.collection.find({}, fields, batch_size=batch_size).sort('_id', 1)
+
+    def import_jobs(self, rows, posted_by, batch_size=500, max_rows=None, max_errors=1000):
+        """Validate and insert imported rows with one insert_many per batch.
+
+        rows yields (row_number, row, parse_error). Returns counts plus the
+        first max_errors per-row errors; invalid rows and rows the database
+        rejects are skipped without stopping the import.
+        """
+        summary = {'received': 0, 'inserted': 0, 'failed': 0, 'errors': [], 'errors_truncated': False}
+
+        def fail(row_number, error):
+            summary['failed'] += 1
+            if len(summary['errors']) < max_errors:
+                summary['errors'].append({'row': row_number, 'error': error})
+            else:
+                summary['errors_truncated'] = True
+
+        def flush(batch):
+            try:
+                summary['inserted'] += len(self.collection.insert_many([job for _, job in batch], ordered=False).inserted_ids)
+            except BulkWriteError as e:
+                summary['inserted'] += e.details.get('nInserted', 0)
+                for error in e.details.get('writeErrors', []):
+                    fail(batch[error['index']][0], error.get('errmsg', 'Write failed'))
+            except Exception as e:
+                for row_number, _ in batch:
+                    fail(row_number, f'Write failed: {e}')
+
+        batch = []
+        for row_number, row, parse_error in rows:
+            if max_rows is not None and summary['received'] >= max_rows:
+                fail(row_number, f'Import limit of {max_rows} rows reached')
+                break
+            summary['received'] += 1
+            if parse_error:
+                fail(row_number, parse_error)
+                continue
+
+            job, error = validate_job(row)
+            if error:
+                fail(row_number, error)
+                continue
+
+            now = datetime.utcnow()
+            batch.append((row_number, dict(job, posted_by=posted_by, created_at=now, updated_at=now)))
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+
+        return summary
@@ -0,0 +1,74 @@
+from flask import Blueprint, request, jsonify
+from src.database.connection import db_connection
+from src.models.job_model import JobModel, JOBS_PAGE_SIZE, JOBS_MAX_PAGE_SIZE, FILTER_FIELDS, JOB_FIELDS, DEFAULT_JOB_FIELDS
+from datetime import datetime
+from bson import ObjectId
+
+jobs_bp = Blueprint('jobs', __name__)
+job_model = JobModel()
+
+MAX_QUERY_LENGTH = 200
+
+def encode_job_cursor(job, ranked):
+    key = repr(job['relevance']) if ranked else job['created_at'].isoformat()
+    return f"{key}_{job['_id']}"
+
+def decode_job_cursor(cursor, ranked):
+    key, _, job_id = cursor.rpartition('_')
+    if not ObjectId.is_valid(job_id):
+        raise ValueError('Invalid cursor')
+    return (float(key) if ranked else datetime.fromisoformat(key)), ObjectId(job_id)
+
+@jobs_bp.route('/search', methods=['GET'])
+def search_jobs():
+    """Search job postings.
+
+    q is matched against title, company and description; location, job_type
+    and status (default active) may be repeated to accept several values;
+    fields is a comma-separated list of fields to return.
+    """
+    if db_connection.get_database() is None:
+        return jsonify({'error': 'Database connection failed'}), 500
+
+    text = request.args.get('q', '').strip()
+    if len(text) > MAX_QUERY_LENGTH:
+        return jsonify({'error': f'Search text is limited to {MAX_QUERY_LENGTH} characters'}), 400
+
+    filters = {}
+    for field in FILTER_FIELDS:
+        values = [value.strip() for value in request.args.getlist(field) if value.strip()]
+        if values:
+            filters[field] = values
+    filters.setdefault('status', ['active'])
+
+    fields = DEFAULT_JOB_FIELDS
+    if request.args.get('fields'):
+        fields = [field.strip() for field in request.args['fields'].split(',') if field.strip()]
+        unknown = [field for field in fields if field not in JOB_FIELDS]
+        if unknown:
+            return jsonify({'error': f"Unknown fields: {', '.join(unknown)}"}), 400
+
+    try:
+        limit = min(max(int(request.args.get('limit', JOBS_PAGE_SIZE)), 1), JOBS_MAX_PAGE_SIZE)
+        cursor = request.args.get('cursor')
+        after = decode_job_cursor(cursor, bool(text)) if cursor else None
+    except ValueError:
+        return jsonify({'error': 'Invalid limit or cursor'}), 400
+
+    try:
+        page, has_more = job_model.search(text or None, filters, limit, after, fields)
+    except Exception as e:
+        return jsonify({'error': f'Failed to search jobs: {str(e)}'}), 500
+
+    jobs = []
+    for job in page:
+        result = {'id': str(job['_id'])}
+        result.update({field: job.get(field) for field in fields})
+        if text:
+            result['relevance'] = round(job['relevance'], 3)
+        jobs.append(result)
+
+    return jsonify({
+        'jobs': jobs,
+        'next_cursor': encode_job_cursor(page[-1], bool(text)) if has_more else None
+    })
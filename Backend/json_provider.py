@@ -0,0 +1,70 @@
+import json
+import decimal
+import uuid
+from datetime import date, datetime
+from bson import ObjectId
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def json_default(o):
+    """Types MongoDB documents carry that JSON lacks: ObjectId as its hex string, dates as ISO 8601"""
+    if isinstance(o, ObjectId):
+        return str(o)
+    if isinstance(o, (datetime, date)):
+        return o.isoformat()
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON provider that encodes with orjson when it is installed.
+
+    datetime and ObjectId values can be returned as-is from views. Objects
+    orjson refuses (e.g. integers wider than 64 bits) fall back to the
+    standard library encoder with the same defaults.
+    """
+
+    def _orjson_option(self, pretty):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def _encode(self, obj, pretty=False):
+        if orjson is not None:
+            try:
+                return orjson.dumps(obj, default=json_default, option=self._orjson_option(pretty))
+            except TypeError:
+                pass
+        return json.dumps(
+            obj,
+            default=json_default,
+            ensure_ascii=self.ensure_ascii,
+            sort_keys=self.sort_keys,
+            indent=2 if pretty else None,
+            separators=None if pretty else (',', ':')
+        ).encode()
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            kwargs.setdefault('default', json_default)
+            return super().dumps(obj, **kwargs)
+        return self._encode(obj).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self._encode(obj, pretty) + b'\n', mimetype=self.mimetype)
@@ -0,0 +1,129 @@
+import os
+import json
+import time
+import logging
+from collections import deque, Counter
+
+DEFAULT_KEYWORDS_FILE = os.path.join(os.path.dirname(__file__), 'ats_keywords.json')
+# How many leading terms of an industry list count as its core keywords
+CORE_KEYWORDS_PER_INDUSTRY = 15
+# Soft skills shared by every industry; only chosen when nothing else matches
+GENERAL_INDUSTRY = 'general'
+
+def _is_word_char(char):
+    return char.isalnum() or char == '_'
+
+class KeywordIndex:
+    """Aho-Corasick automaton over a skill/keyword dictionary.
+
+    The dictionary is compiled once into a trie with failure links, so a
+    single left-to-right pass over the text reports every term it contains.
+    Matching cost depends on the text length and the number of matches,
+    not on how many terms the dictionary holds.
+    """
+
+    def __init__(self, industries):
+        self.terms = []
+        self.term_industries = []
+        self.core_terms = {}
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+
+        term_ids = {}
+        for industry, keywords in industries.items():
+            core = []
+            for position, keyword in enumerate(keywords):
+                term = ' '.join(keyword.lower().split())
+                if not term:
+                    continue
+                if term not in term_ids:
+                    term_ids[term] = len(self.terms)
+                    self.terms.append(term)
+                    self.term_industries.append(set())
+                    self._insert(term, term_ids[term])
+                self.term_industries[term_ids[term]].add(industry)
+                if position < CORE_KEYWORDS_PER_INDUSTRY:
+                    core.append(term_ids[term])
+            self.core_terms[industry] = core
+
+        self._build_failure_links()
+
+    def _insert(self, term, term_id):
+        state = 0
+        for char in term:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state] = self._output[state] + ((term_id, len(term)),)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                # Inherit matches that end at the failure state
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find(self, text):
+        """Return the ids of every dictionary term found as a whole word in text"""
+        text = ' '.join(text.lower().split())
+        goto, fail, output = self._goto, self._fail, self._output
+        length = len(text)
+        found = set()
+        state = 0
+
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            for term_id, term_length in output[state]:
+                if term_id in found:
+                    continue
+                start = position - term_length + 1
+                if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+                    continue
+                if position + 1 < length and _is_word_char(text[position + 1]) and _is_word_char(char):
+                    continue
+                found.add(term_id)
+
+        return found
+
+    def analyse(self, text):
+        """Keywords found in text, its most likely industry, and that industry's missing core keywords"""
+        found = self.find(text)
+
+        industry_hits = Counter()
+        for term_id in found:
+            industry_hits.update(self.term_industries[term_id])
+        if len(industry_hits) > 1:
+            industry_hits.pop(GENERAL_INDUSTRY, None)
+        industry = industry_hits.most_common(1)[0][0] if industry_hits else None
+
+        missing = [self.terms[term_id] for term_id in self.core_terms.get(industry, []) if term_id not in found]
+
+        return {
+            'industry': industry,
+            'found': sorted(self.terms[term_id] for term_id in found),
+            'missing': missing
+        }
+
+    @classmethod
+    def from_file(cls, path=None):
+        path = path or os.getenv('ATS_KEYWORDS_FILE') or DEFAULT_KEYWORDS_FILE
+        started = time.perf_counter()
+        with open(path, encoding='utf-8') as keywords_file:
+            index = cls(json.load(keywords_file))
+        logging.info(f"Compiled {len(index.terms)} ATS keywords into {len(index._goto)} automaton states in {(time.perf_counter() - started) * 1000:.1f} ms")
+        return index
@@ -0,0 +1,111 @@
+import re
+import hashlib
+import numpy as np
+
+# Sub-scores in the order their digest bytes are read (byte 0 is the overall score)
+SCORE_FIELDS = ('heading', 'profile_photo', 'banner', 'skills', 'experience', 'connections', 'education')
+
+# Premium feedback per sub-score: (score above 80, otherwise)
+FEEDBACK = {
+    'heading': ('Excellent professional headline', 'Consider adding more industry-specific keywords'),
+    'profile_photo': ('Professional photo present', 'Consider updating to a more professional headshot'),
+    'banner': ('Great custom banner', 'Consider customizing your banner to reflect your personal brand'),
+    'skills': ('Comprehensive skills section', 'Add more relevant skills and seek endorsements'),
+    'experience': ('Detailed experience with achievements', 'Add more specific achievements and metrics'),
+    'connections': ('Strong professional network', 'Expand your network by connecting with industry professionals'),
+    'education': ('Complete education information', 'Add more details to your education section')
+}
+
+# Premium recommendation for each sub-score below 80
+RECOMMENDATIONS = {
+    'heading': 'Optimize your professional headline with industry keywords',
+    'profile_photo': 'Update your profile photo to a professional headshot',
+    'banner': 'Customize your LinkedIn banner to reflect your personal brand',
+    'skills': 'Add more relevant skills and get endorsements',
+    'experience': 'Enhance your experience section with achievements and metrics',
+    'connections': 'Expand your professional network by connecting with industry peers',
+    'education': 'Complete your education section with relevant details'
+}
+ALL_GOOD_RECOMMENDATION = 'Your profile looks great! Keep engaging with your network.'
+FREE_RECOMMENDATIONS = [
+    'Upgrade to premium for detailed recommendations',
+    'Get personalized improvement suggestions',
+    'Access industry-specific optimization tips'
+]
+
+# Feedback and recommendations depend only on which sub-scores pass their
+# threshold, so they are looked up by a 7-bit pass mask instead of branching
+# per field. Results share these objects; callers must not modify them.
+_FIELD_BITS = 1 << np.arange(len(SCORE_FIELDS))
+_FEEDBACK_BY_MASK = [
+    {field: FEEDBACK[field][0 if mask & (1 << i) else 1] for i, field in enumerate(SCORE_FIELDS)}
+    for mask in range(1 << len(SCORE_FIELDS))
+]
+_RECOMMENDATIONS_BY_MASK = [
+    [RECOMMENDATIONS[field] for i, field in enumerate(SCORE_FIELDS) if not mask & (1 << i)] or [ALL_GOOD_RECOMMENDATION]
+    for mask in range(1 << len(SCORE_FIELDS))
+]
+
+PROFILE_URL = re.compile(
+    r'^(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/in/([a-z0-9-]+)/?(?:[?#].*)?$',
+    re.IGNORECASE
+)
+
+def canonical_profile_url(url):
+    """https://www.linkedin.com/in/<slug> for any form of a profile URL, or None if it isn't one"""
+    match = PROFILE_URL.match(url.strip())
+    if not match:
+        return None
+    return f'https://www.linkedin.com/in/{match.group(1).lower()}'
+
+def score_profiles(profile_urls, is_paid=False):
+    """Scores for N canonical profile URLs as arrays: (overall (N,), detailed (N, 7))"""
+    digests = np.frombuffer(
+        b''.join(hashlib.md5(url.encode()).digest() for url in profile_urls),
+        dtype=np.uint8
+    ).reshape(len(profile_urls), 16).astype(np.int16)
+
+    if is_paid:
+        # Paid users get detailed scores (70-95 overall, 70-100 per section)
+        return digests[:, 0] % 26 + 70, digests[:, 1:8] % 31 + 70
+    # Free users get lower scores (30-65)
+    return digests[:, 0] % 36 + 30, digests[:, 1:8] % 36 + 30
+
+def review_profiles(profile_urls, is_paid=False):
+    """Score, feedback and recommendations for each canonical profile URL, in order.
+
+    Premium results carry 'feedback' as {field: text}; see detailed_feedback()
+    for the per-field score/feedback form used by the single-profile review.
+    """
+    if not profile_urls:
+        return []
+
+    overall, detailed = score_profiles(profile_urls, is_paid)
+    overall_scores = overall.tolist()
+    detailed_rows = detailed.tolist()
+    if is_paid:
+        feedback_masks = ((detailed > 80) * _FIELD_BITS).sum(axis=1).tolist()
+        recommendation_masks = ((detailed >= 80) * _FIELD_BITS).sum(axis=1).tolist()
+
+    results = []
+    for row, profile_url in enumerate(profile_urls):
+        scores = dict(zip(SCORE_FIELDS, detailed_rows[row]))
+        result = {
+            'profile_url': profile_url,
+            'overall_score': overall_scores[row],
+            'detailed_scores': scores
+        }
+        if is_paid:
+            result['feedback'] = _FEEDBACK_BY_MASK[feedback_masks[row]]
+            result['recommendations'] = _RECOMMENDATIONS_BY_MASK[recommendation_masks[row]]
+        else:
+            result['recommendations'] = FREE_RECOMMENDATIONS
+        results.append(result)
+    return results
+
+def detailed_feedback(review):
+    """{field: {'score', 'feedback'}} for a premium review"""
+    return {
+        field: {'score': review['detailed_scores'][field], 'feedback': review['feedback'][field]}
+        for field in SCORE_FIELDS
+    }
@@ -1,7 +1,7 @@
 import os
 import sys
 from dotenv import load_dotenv
-from flask import Flask, send_from_directory
+from flask import Flask
 from flask_cors import CORS
 
 # Load environment variables
@@ -15,9 +15,27 @@ from src.routes.auth import auth_bp
 from src.routes.ats import ats_bp
 from src.routes.linkedin import linkedin_bp
 from src.routes.admin import admin_bp
+from src.routes.jobs import jobs_bp
+from src.routes.blog import blog_bp
 from src.database.connection import db_connection
+from src.database.indexes import ensure_indexes, find_collection_scans
+from src.models.user_model import UserModel
+from src.models.stats_model import StatsModel
+from src.models.rollup_model import RollupModel
+from src.models.score_stats_model import ScoreStatsModel, SCORE_KINDS
+from src.services.resume_parser import SpooledRequest
+from src.services.static_assets import StaticManifest, asset_response, precompress_folder
+from src.services.json_provider import FastJSONProvider
+from src.services.compression import compress_response
+from src.services.blog_index import blog_index
 
 app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
+# Spool uploads through bounded memory instead of buffering whole files
+app.request_class = SpooledRequest
+# orjson-backed JSON that accepts datetime and ObjectId values
+app.json = FastJSONProvider(app)
+# Compress buffered JSON/text responses the client can decode
+app.after_request(compress_response)
 
 # Configuration
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'your-secret-key-here')
@@ -26,14 +44,21 @@ app.config['MAX_CONTENT_LENGTH'] = int(os.getenv('MAX_FILE_SIZE', 10485760))
 # Enable CORS for all routes
 CORS(app, origins="*")
 
-# Initialize database connection
-db_connection.connect()
+# The database connects on first use in each process; indexes are applied and
+# the blog search index is loaded once it is reachable
+db_connection.on_connect(ensure_indexes)
+db_connection.on_connect(lambda db: blog_index.ensure_started())
 
 # Register blueprints
 app.register_blueprint(auth_bp, url_prefix='/api/auth')
 app.register_blueprint(ats_bp, url_prefix='/api/ats')
 app.register_blueprint(linkedin_bp, url_prefix='/api/linkedin')
 app.register_blueprint(admin_bp, url_prefix='/api/admin')
+app.register_blueprint(jobs_bp, url_prefix='/api/jobs')
+app.register_blueprint(blog_bp, url_prefix='/api/blog')
+
+# Static files are read, hashed and compressed once at startup
+static_manifest = StaticManifest(app.static_folder)
 
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
@@ -42,18 +67,63 @@ def serve(path):
     if static_folder_path is None:
         return "Static folder not configured", 404
 
-    if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
-        return send_from_directory(static_folder_path, path)
-    else:
-        index_path = os.path.join(static_folder_path, 'index.html')
-        if os.path.exists(index_path):
-            return send_from_directory(static_folder_path, 'index.html')
-        else:
+    asset = static_manifest.get(path) if path else None
+    if asset is None:
+        # A missing build asset is a stale reference, not a client-side route
+        if path.startswith('assets/'):
+            return "File not found", 404
+        asset = static_manifest.index
+        if asset is None:
             return "index.html not found", 404
+    return asset_response(asset)
+
+@app.cli.command('migrate-score-history')
+def migrate_score_history():
+    """Move score arrays out of user documents into the score collections"""
+    moved = UserModel().migrate_score_history()
+    print(f"Migrated {moved['ats_scores']} ATS and {moved['linkedin_scores']} LinkedIn scores from {moved['users']} users")
+    print("Run reconcile-stats to bring the counters and score statistics up to date")
+
+@app.cli.command('reconcile-stats')
+def reconcile_stats():
+    """Recompute the site-wide counters and score statistics from the source collections"""
+    totals = StatsModel().reconcile()
+    print(f"Reconciled stats: {totals}")
+    score_stats = ScoreStatsModel()
+    for kind in SCORE_KINDS:
+        document = score_stats.reconcile(kind) or {}
+        print(f"Reconciled {kind} score statistics: {document.get('count', 0)} scores")
+
+@app.cli.command('refresh-rollups')
+def refresh_rollups():
+    """Recompute the daily rollup buckets touched since the last run"""
+    days = RollupModel().refresh()
+    print(f"Refreshed {days} daily rollups")
+
+@app.cli.command('precompress-static')
+def precompress_static():
+    """Write .gz and .br variants of the static files for the server to load as-is"""
+    written = precompress_folder(app.static_folder)
+    print(f"Wrote {written} precompressed files in {app.static_folder}")
+
+@app.cli.command('ensure-indexes')
+def ensure_indexes_command():
+    """Create any missing indexes and report queries that still scan whole collections"""
+    db = db_connection.get_database()
+    if db is None:
+        print("Database is not available")
+        return
+    for failure in ensure_indexes(db):
+        print(f"Could not index {failure['collection']}: {failure['error']}")
+    scans = find_collection_scans(db)
+    for scan in scans:
+        print(f"COLLSCAN: {scan['query']} on {scan['collection']}")
+    if not scans:
+        print("All checked queries use an index")
 
 @app.route('/api/health')
 def health_check():
-    return {'status': 'healthy', 'message': 'EaseMyForm API is running'}
+    return {'status': 'healthy', 'message': 'EaseMyForm API is running', 'database': db_connection.status()}
 
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=True)
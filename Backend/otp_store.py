@@ -0,0 +1,174 @@
+import os
+import stat
+import time
+import heapq
+import sqlite3
+import threading
+
+# Most outstanding OTPs kept at once; the ones closest to expiry are dropped first
+OTP_STORE_MAX_ENTRIES = int(os.getenv('OTP_STORE_MAX_ENTRIES', 100000))
+# Expired OTPs are swept at most this often, piggybacking on store calls
+OTP_SWEEP_INTERVAL_SECONDS = int(os.getenv('OTP_SWEEP_INTERVAL_SECONDS', 30))
+# Flask's instance folder, beside the src package
+INSTANCE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'instance')
+
+def _create_private_file(path):
+    """Create path readable only by this user, or check that an existing one is ours"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+    try:
+        os.close(os.open(path, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o600))
+    except FileExistsError:
+        info = os.lstat(path)
+        if not stat.S_ISREG(info.st_mode):
+            raise PermissionError(f'OTP store {path} is not a regular file')
+        if hasattr(os, 'getuid') and info.st_uid != os.getuid():
+            raise PermissionError(f'OTP store {path} is owned by another user')
+
+class MemoryOTPStore:
+    """Process-local OTP store with expiry sweeping and a size bound.
+
+    Only suitable for a single server process; use SQLiteOTPStore when
+    running several gunicorn workers.
+    """
+
+    def __init__(self, max_entries=OTP_STORE_MAX_ENTRIES, sweep_interval=OTP_SWEEP_INTERVAL_SECONDS):
+        self.max_entries = max_entries
+        self.sweep_interval = sweep_interval
+        self._entries = {}
+        # (expires_at, phone_number); entries replaced by a newer OTP are skipped lazily
+        self._expiry_heap = []
+        self._last_sweep = time.time()
+        self._lock = threading.Lock()
+
+    def _pop_soonest(self):
+        while self._expiry_heap:
+            expires_at, phone_number = heapq.heappop(self._expiry_heap)
+            entry = self._entries.get(phone_number)
+            if entry and entry['expires_at'] == expires_at:
+                del self._entries[phone_number]
+                return expires_at
+        return None
+
+    def _sweep(self, now):
+        removed = 0
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            if self._pop_soonest() is not None:
+                removed += 1
+        self._last_sweep = now
+        return removed
+
+    def put(self, phone_number, otp, ttl_seconds):
+        now = time.time()
+        expires_at = now + ttl_seconds
+        with self._lock:
+            if now - self._last_sweep >= self.sweep_interval:
+                self._sweep(now)
+            if phone_number not in self._entries and len(self._entries) >= self.max_entries:
+                self._sweep(now)
+                while len(self._entries) >= self.max_entries:
+                    self._pop_soonest()
+            self._entries[phone_number] = {'otp': otp, 'expires_at': expires_at}
+            heapq.heappush(self._expiry_heap, (expires_at, phone_number))
+            # Rebuild once stale heap entries clearly outnumber live ones
+            if len(self._expiry_heap) > 2 * len(self._entries) + 1024:
+                self._expiry_heap = [(entry['expires_at'], phone) for phone, entry in self._entries.items()]
+                heapq.heapify(self._expiry_heap)
+
+    def get(self, phone_number):
+        """Stored {'otp', 'expires_at'} for a phone number; may already be expired"""
+        with self._lock:
+            entry = self._entries.get(phone_number)
+            return dict(entry) if entry else None
+
+    def delete(self, phone_number):
+        with self._lock:
+            self._entries.pop(phone_number, None)
+
+    def sweep(self):
+        with self._lock:
+            return self._sweep(time.time())
+
+    def __len__(self):
+        return len(self._entries)
+
+class SQLiteOTPStore:
+    """OTP store in an embedded SQLite database shared by every process on the host"""
+
+    def __init__(self, path, max_entries=OTP_STORE_MAX_ENTRIES, sweep_interval=OTP_SWEEP_INTERVAL_SECONDS):
+        self.path = path
+        self.max_entries = max_entries
+        self.sweep_interval = sweep_interval
+        self._local = threading.local()
+        self._last_sweep = 0
+        _create_private_file(path)
+        with self._connection() as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS otps ('
+                'phone_number TEXT PRIMARY KEY, otp TEXT NOT NULL, expires_at REAL NOT NULL)'
+            )
+            connection.execute('CREATE INDEX IF NOT EXISTS otps_expires_at ON otps (expires_at)')
+
+    def _connection(self):
+        # One connection per thread, reopened after a fork
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def put(self, phone_number, otp, ttl_seconds):
+        now = time.time()
+        connection = self._connection()
+        with connection:
+            connection.execute('BEGIN IMMEDIATE')
+            if now - self._last_sweep >= self.sweep_interval:
+                self._sweep(connection, now)
+            connection.execute(
+                'INSERT OR REPLACE INTO otps (phone_number, otp, expires_at) VALUES (?, ?, ?)',
+                (phone_number, otp, now + ttl_seconds)
+            )
+            # Hard size bound: drop whatever is closest to expiry
+            connection.execute(
+                'DELETE FROM otps WHERE phone_number IN ('
+                'SELECT phone_number FROM otps ORDER BY expires_at '
+                'LIMIT MAX(0, (SELECT COUNT(*) FROM otps) - ?))',
+                (self.max_entries,)
+            )
+
+    def get(self, phone_number):
+        """Stored {'otp', 'expires_at'} for a phone number; may already be expired"""
+        row = self._connection().execute(
+            'SELECT otp, expires_at FROM otps WHERE phone_number = ?', (phone_number,)
+        ).fetchone()
+        return {'otp': row[0], 'expires_at': row[1]} if row else None
+
+    def delete(self, phone_number):
+        self._connection().execute('DELETE FROM otps WHERE phone_number = ?', (phone_number,))
+
+    def _sweep(self, connection, now):
+        removed = connection.execute('DELETE FROM otps WHERE expires_at <= ?', (now,)).rowcount
+        self._last_sweep = now
+        return removed
+
+    def sweep(self):
+        connection = self._connection()
+        with connection:
+            return self._sweep(connection, time.time())
+
+    def __len__(self):
+        return self._connection().execute('SELECT COUNT(*) FROM otps').fetchone()[0]
+
+def create_otp_store():
+    """OTP store selected by OTP_STORE: 'sqlite' (default, shared across workers) or 'memory'"""
+    backend = os.getenv('OTP_STORE', 'sqlite').lower()
+    if backend == 'memory':
+        return MemoryOTPStore()
+    if backend == 'sqlite':
+        path = os.getenv('OTP_STORE_PATH') or os.path.join(INSTANCE_DIR, 'otp.db')
+        return SQLiteOTPStore(path)
+    raise ValueError(f'Unknown OTP_STORE backend: {backend}')
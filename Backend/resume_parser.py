@@ -0,0 +1,201 @@
+import os
+import re
+import hashlib
+import tempfile
+import threading
+import time
+import zipfile
+import logging
+from xml.etree.ElementTree import iterparse, ParseError
+from flask import Request
+
+try:
+    from pypdf import PdfReader
+    from pypdf.errors import PdfReadError
+except ImportError:
+    PdfReader = None
+    PdfReadError = Exception
+
+# Uploads larger than this roll over from memory to a temporary file on disk
+SPOOL_MAX_MEMORY = int(os.getenv('RESUME_SPOOL_MAX_MEMORY', 256 * 1024))
+# Caps how many uploads a worker parses at once, so memory stays flat under load
+MAX_CONCURRENT_EXTRACTIONS = int(os.getenv('MAX_CONCURRENT_EXTRACTIONS', 4))
+# Resumes are a few pages long; anything past this is ignored
+MAX_EXTRACTED_CHARS = int(os.getenv('MAX_EXTRACTED_CHARS', 200000))
+
+CHUNK_SIZE = 64 * 1024
+BYTES_PER_MB = 1024 * 1024
+
+WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+PRINTABLE_RUN = re.compile(rb'[\x20-\x7e]{4,}')
+PRINTABLE_RUN_UTF16 = re.compile(rb'(?:[\x20-\x7e]\x00){4,}')
+
+_extraction_slots = threading.BoundedSemaphore(MAX_CONCURRENT_EXTRACTIONS)
+
+class ExtractionError(Exception):
+    """Raised when no text can be read from an uploaded resume"""
+
+class HashingSpool(tempfile.SpooledTemporaryFile):
+    """Spooled upload that computes a SHA-256 of its contents as it is written"""
+
+    def __init__(self, max_size=SPOOL_MAX_MEMORY):
+        super().__init__(max_size=max_size)
+        self._digest = hashlib.sha256()
+
+    def write(self, data):
+        self._digest.update(data)
+        return super().write(data)
+
+    def hexdigest(self):
+        return self._digest.hexdigest()
+
+class SpooledRequest(Request):
+    """Request that parses file uploads into a bounded-memory spool"""
+
+    # Views receiving many files at once can lower this before touching request.files
+    spool_max_memory = SPOOL_MAX_MEMORY
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return HashingSpool(max_size=self.spool_max_memory)
+
+def file_extension(filename):
+    return filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
+
+def upload_digest(stream):
+    """SHA-256 of an upload's bytes, reusing the digest taken while spooling"""
+    if isinstance(stream, HashingSpool):
+        return stream.hexdigest()
+
+    digest = hashlib.sha256()
+    stream.seek(0)
+    for chunk in iter(lambda: stream.read(CHUNK_SIZE), b''):
+        digest.update(chunk)
+    stream.seek(0)
+    return digest.hexdigest()
+
+def spool_to_disk(stream, extension, max_bytes=None):
+    """Copy a resume stream to a temporary file a worker process can open; returns (path, sha256)"""
+    handle, path = tempfile.mkstemp(suffix='.' + extension)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(handle, 'wb') as target:
+            for chunk in iter(lambda: stream.read(CHUNK_SIZE), b''):
+                size += len(chunk)
+                if max_bytes and size > max_bytes:
+                    raise ExtractionError(f'File is larger than {max_bytes} bytes')
+                digest.update(chunk)
+                target.write(chunk)
+    except Exception:
+        os.remove(path)
+        raise
+    return path, digest.hexdigest()
+
+def _stream_size(stream):
+    position = stream.tell()
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(position)
+    return size
+
+class _TextBuffer:
+    """Collects extracted text up to MAX_EXTRACTED_CHARS"""
+
+    def __init__(self):
+        self.parts = []
+        self.length = 0
+
+    @property
+    def full(self):
+        return self.length >= MAX_EXTRACTED_CHARS
+
+    def add(self, text):
+        if not text or self.full:
+            return
+        text = text[:MAX_EXTRACTED_CHARS - self.length]
+        self.parts.append(text)
+        self.length += len(text)
+
+    def text(self):
+        return ''.join(self.parts)
+
+def _extract_pdf(stream, buffer):
+    if PdfReader is None:
+        raise ExtractionError('PDF support is not installed on this server')
+    try:
+        reader = PdfReader(stream)
+        if reader.is_encrypted:
+            reader.decrypt('')
+        for page in reader.pages:
+            buffer.add(page.extract_text() or '')
+            buffer.add('\n')
+            if buffer.full:
+                break
+    except (PdfReadError, ValueError, KeyError) as e:
+        raise ExtractionError(f'Could not read PDF: {e}')
+
+def _extract_docx(stream, buffer):
+    try:
+        with zipfile.ZipFile(stream) as archive:
+            with archive.open('word/document.xml') as document:
+                # iterparse keeps only the current element alive, not the whole tree
+                for event, element in iterparse(document, events=('end',)):
+                    if element.tag == WORD_NAMESPACE + 't':
+                        buffer.add(element.text)
+                    elif element.tag == WORD_NAMESPACE + 'tab':
+                        buffer.add('\t')
+                    elif element.tag == WORD_NAMESPACE + 'p':
+                        buffer.add('\n')
+                        element.clear()
+                    if buffer.full:
+                        break
+    # RuntimeError: encrypted entry; NotImplementedError: unsupported compression method
+    except (zipfile.BadZipFile, zipfile.LargeZipFile, KeyError, ParseError, RuntimeError, NotImplementedError) as e:
+        raise ExtractionError(f'Could not read DOCX: {e}')
+
+def _extract_doc(stream, buffer):
+    """Best-effort text recovery from legacy binary Word files"""
+    while not buffer.full:
+        chunk = stream.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        for run in PRINTABLE_RUN_UTF16.findall(chunk):
+            buffer.add(run.decode('utf-16-le') + '\n')
+        for run in PRINTABLE_RUN.findall(chunk):
+            buffer.add(run.decode('ascii') + '\n')
+
+EXTRACTORS = {
+    'pdf': _extract_pdf,
+    'docx': _extract_docx,
+    'doc': _extract_doc
+}
+
+def extract_resume_text(stream, extension):
+    """Extract plain text from a PDF/DOC/DOCX stream and report extraction speed"""
+    extractor = EXTRACTORS.get(extension)
+    if extractor is None:
+        raise ExtractionError(f'Unsupported file type: {extension}')
+
+    size = _stream_size(stream)
+    stream.seek(0)
+    buffer = _TextBuffer()
+
+    with _extraction_slots:
+        started = time.perf_counter()
+        extractor(stream, buffer)
+        elapsed = time.perf_counter() - started
+
+    text = buffer.text()
+    if not text.strip():
+        raise ExtractionError('No readable text found in the uploaded file')
+
+    size_mb = size / BYTES_PER_MB
+    ms_per_mb = round(elapsed * 1000 / size_mb, 2) if size_mb else 0.0
+    logging.info(f"Extracted {len(text)} chars from {size} byte {extension} in {elapsed * 1000:.1f} ms ({ms_per_mb} ms/MB)")
+
+    return {
+        'text': text,
+        'bytes': size,
+        'extraction_ms': round(elapsed * 1000, 2),
+        'ms_per_mb': ms_per_mb
+    }
@@ -0,0 +1,109 @@
+from src.database.connection import db_connection
+from datetime import datetime, timedelta
+from pymongo import UpdateOne
+import os
+
+# Documents can land with a timestamp slightly before they are written (the
+# score writer flushes in the background), so each run re-reads this far back
+ROLLUP_LAG_SECONDS = int(os.getenv('ROLLUP_LAG_SECONDS', 300))
+# Longest date range one request may ask for
+ROLLUP_MAX_DAYS = int(os.getenv('ROLLUP_MAX_DAYS', 731))
+
+DAY_FORMAT = '%Y-%m-%d'
+ROLLUP_FIELDS = (
+    'signups',
+    'ats_checks', 'ats_paid', 'ats_free',
+    'linkedin_reviews', 'linkedin_paid', 'linkedin_free'
+)
+WATERMARK_ID = 'rollups:watermark'
+
+def day_start(moment):
+    return datetime(moment.year, moment.month, moment.day)
+
+class RollupModel:
+    """Per-day summary documents in daily_rollups, keyed by 'YYYY-MM-DD'"""
+
+    @property
+    def db(self):
+        return db_connection.get_database()
+
+    def _count_by_day(self, collection, field, since, paid_field=None):
+        match = {field: {'$gte': since}} if since else {field: {'$type': 'date'}}
+        group = {
+            '_id': {'$dateToString': {'format': DAY_FORMAT, 'date': f'${field}'}},
+            'count': {'$sum': 1}
+        }
+        if paid_field:
+            group['paid'] = {'$sum': {'$cond': [{'$eq': [f'${paid_field}', True]}, 1, 0]}}
+        return {row['_id']: row for row in collection.aggregate([{'$match': match}, {'$group': group}])}
+
+    def refresh(self, now=None):
+        """Recompute every day bucket touched since the last run; returns the number of days written.
+
+        The first run backfills from all existing data.
+        """
+        db = self.db
+        if db is None:
+            return 0
+
+        now = now or datetime.utcnow()
+        watermark = db.stats.find_one({'_id': WATERMARK_ID})
+        since = None
+        if watermark:
+            since = day_start(watermark['refreshed_at'] - timedelta(seconds=ROLLUP_LAG_SECONDS))
+
+        signups = self._count_by_day(db.users, 'created_at', since)
+        ats = self._count_by_day(db.ats_scores, 'timestamp', since, paid_field='paid')
+        linkedin = self._count_by_day(db.linkedin_scores, 'timestamp', since, paid_field='paid')
+
+        days = set(signups) | set(ats) | set(linkedin)
+        if since:
+            # Recomputed days are rewritten in full, including ones that are now empty
+            day = since
+            while day <= now:
+                days.add(day.strftime(DAY_FORMAT))
+                day += timedelta(days=1)
+
+        updates = []
+        for day in sorted(days):
+            ats_day = ats.get(day, {})
+            linkedin_day = linkedin.get(day, {})
+            rollup = {
+                'date': datetime.strptime(day, DAY_FORMAT),
+                'signups': signups.get(day, {}).get('count', 0),
+                'ats_checks': ats_day.get('count', 0),
+                'ats_paid': ats_day.get('paid', 0),
+                'ats_free': ats_day.get('count', 0) - ats_day.get('paid', 0),
+                'linkedin_reviews': linkedin_day.get('count', 0),
+                'linkedin_paid': linkedin_day.get('paid', 0),
+                'linkedin_free': linkedin_day.get('count', 0) - linkedin_day.get('paid', 0),
+                'updated_at': now
+            }
+            updates.append(UpdateOne({'_id': day}, {'$set': rollup}, upsert=True))
+
+        if updates:
+            db.daily_rollups.bulk_write(updates, ordered=False)
+        db.stats.update_one({'_id': WATERMARK_ID}, {'$set': {'refreshed_at': now}}, upsert=True)
+        return len(updates)
+
+    def get_range(self, start, end):
+        """One entry per day from start to end inclusive, zero-filled where nothing happened"""
+        db = self.db
+        if db is None:
+            return None
+
+        first, last = start.strftime(DAY_FORMAT), end.strftime(DAY_FORMAT)
+        stored = {
+            rollup['_id']: rollup
+            for rollup in db.daily_rollups.find({'_id': {'$gte': first, '$lte': last}}, {'date': 0, 'updated_at': 0})
+        }
+
+        days = []
+        day = day_start(start)
+        while day <= end:
+            key = day.strftime(DAY_FORMAT)
+            rollup = stored.get(key, {})
+            days.append(dict({field: rollup.get(field, 0) for field in ROLLUP_FIELDS}, date=key))
+            day += timedelta(days=1)
+        return days
+
@@ -0,0 +1,219 @@
+from src.database.connection import db_connection
+from datetime import datetime
+from pymongo import ReplaceOne, ReturnDocument
+import math
+
+# kind -> (score collection, score field)
+SCORE_KINDS = {
+    'ats': ('ats_scores', 'score'),
+    'linkedin': ('linkedin_scores', 'overall_score')
+}
+KIND_BY_COLLECTION = {collection: kind for kind, (collection, _) in SCORE_KINDS.items()}
+
+# Scores fall into ten buckets, 0-9 ... 90-100
+BUCKET_WIDTH = 10
+BUCKETS = range(0, 100, BUCKET_WIDTH)
+RUNNING_FIELDS = ('count', 'paid', 'sum', 'sum_sq', 'repeat_users', 'improved_users', 'improvement_sum')
+
+EARLIEST = datetime.min
+LATEST = datetime.max
+
+def bucket_for(score):
+    return str(min(max(int(score), 0) // BUCKET_WIDTH * BUCKET_WIDTH, BUCKETS[-1]))
+
+def _user_scores(documents, field):
+    """Numeric scores grouped per user, oldest first: {user_id: [(timestamp, score), ...]}"""
+    scores = {}
+    for document in documents:
+        score = document.get(field)
+        if isinstance(score, (int, float)) and not isinstance(score, bool):
+            scores.setdefault(document['user_id'], []).append((document['timestamp'], score))
+    for history in scores.values():
+        history.sort(key=lambda entry: entry[0])
+    return scores
+
+def _improvement(summary):
+    """(has two or more scores, improved, latest - first) for a score_summaries document"""
+    if not summary or summary.get('count', 0) < 2:
+        return 0, 0, 0
+    delta = summary['latest_score'] - summary['first_score']
+    return 1, int(delta > 0), delta
+
+class ScoreStatsModel:
+    """Running score statistics, updated as the score writer flushes each batch.
+
+    Per kind, the stats document `scores:<kind>` holds the count, sum and
+    sum of squares (for mean and variance), a fixed-bucket histogram and
+    totals over users with at least two scores. score_summaries keeps each
+    user's first and latest score so improvement is known without reading
+    score history.
+    """
+
+    @property
+    def db(self):
+        return db_connection.get_database()
+
+    def record(self, collection_name, documents):
+        """Fold newly written score documents into the running statistics"""
+        kind = KIND_BY_COLLECTION.get(collection_name)
+        db = self.db
+        if kind is None or db is None:
+            return False
+
+        field = SCORE_KINDS[kind][1]
+        increments = dict.fromkeys(RUNNING_FIELDS, 0)
+        for document in documents:
+            score = document.get(field)
+            if not isinstance(score, (int, float)) or isinstance(score, bool):
+                continue
+            increments['count'] += 1
+            increments['paid'] += int(bool(document.get('paid')))
+            increments['sum'] += score
+            increments['sum_sq'] += score * score
+            key = f'histogram.{bucket_for(score)}'
+            increments[key] = increments.get(key, 0) + 1
+
+        for user_id, history in _user_scores(documents, field).items():
+            before = self._update_summary(db, kind, user_id, history)
+            (first_at, first_score), (latest_at, latest_score) = history[0], history[-1]
+            after = {'count': len(history), 'first_score': first_score, 'latest_score': latest_score}
+            if before:
+                after['count'] += before['count']
+                if first_at >= before['first_at']:
+                    after['first_score'] = before['first_score']
+                if latest_at <= before['latest_at']:
+                    after['latest_score'] = before['latest_score']
+
+            for name, old, new in zip(
+                ('repeat_users', 'improved_users', 'improvement_sum'), _improvement(before), _improvement(after)
+            ):
+                increments[name] += new - old
+
+        increments = {name: amount for name, amount in increments.items() if amount}
+        if increments:
+            db.stats.update_one({'_id': f'scores:{kind}'}, {'$inc': increments}, upsert=True)
+        return True
+
+    def _update_summary(self, db, kind, user_id, history):
+        """Merge a user's new scores into their summary; returns the summary as it was before"""
+        (first_at, first_score), (latest_at, latest_score) = history[0], history[-1]
+        # Batches from different processes can land out of order, so only
+        # earlier/later timestamps move the first/latest score
+        is_first = {'$lt': [first_at, {'$ifNull': ['$first_at', LATEST]}]}
+        is_latest = {'$gt': [latest_at, {'$ifNull': ['$latest_at', EARLIEST]}]}
+        return db.score_summaries.find_one_and_update(
+            {'_id': f'{kind}:{user_id}'},
+            [{'$set': {
+                'kind': kind,
+                'user_id': user_id,
+                'first_score': {'$cond': [is_first, first_score, '$first_score']},
+                'first_at': {'$cond': [is_first, first_at, '$first_at']},
+                'latest_score': {'$cond': [is_latest, latest_score, '$latest_score']},
+                'latest_at': {'$cond': [is_latest, latest_at, '$latest_at']},
+                'count': {'$add': [{'$ifNull': ['$count', 0]}, len(history)]}
+            }}],
+            upsert=True,
+            return_document=ReturnDocument.BEFORE
+        )
+
+    def get(self, kind):
+        """Mean, standard deviation, histogram and improvement for one kind of score"""
+        db = self.db
+        document = db.stats.find_one({'_id': f'scores:{kind}'}) if db is not None else None
+        if document is None or 'reconciled_at' not in document:
+            # Not seeded by reconcile-stats yet, so the running fields only cover recent batches
+            document = {}
+        return self._summarise(document)
+
+    def _summarise(self, document):
+        count = document.get('count', 0)
+        mean = document.get('sum', 0) / count if count else 0
+        variance = max(document.get('sum_sq', 0) / count - mean * mean, 0) if count else 0
+        histogram = document.get('histogram', {})
+        repeat_users = document.get('repeat_users', 0)
+
+        return {
+            'count': count,
+            'paid': document.get('paid', 0),
+            'mean': round(mean, 1),
+            'stddev': round(math.sqrt(variance), 1),
+            'histogram': [
+                {
+                    'range': f'{low}-{low + BUCKET_WIDTH - 1 if low < BUCKETS[-1] else 100}',
+                    'count': histogram.get(str(low), 0)
+                }
+                for low in BUCKETS
+            ],
+            'repeat_users': repeat_users,
+            'improved_users': document.get('improved_users', 0),
+            'improvement_rate': round(100 * document.get('improved_users', 0) / repeat_users) if repeat_users else 0,
+            'average_improvement': round(document.get('improvement_sum', 0) / repeat_users, 1) if repeat_users else 0
+        }
+
+    def reconcile(self, kind, batch_size=1000):
+        """Rebuild the statistics and user summaries for one kind from its score collection.
+
+        Run from the reconcile-stats command, not the request path. The
+        running fields are overwritten with the recomputed values, so
+        re-running converges; batches the score writer records while this
+        runs may be missed, so run it while writes are quiet.
+        """
+        db = self.db
+        if db is None:
+            return None
+
+        collection_name, field = SCORE_KINDS[kind]
+        scores = db[collection_name]
+        numeric = {'$match': {field: {'$type': 'number'}}}
+
+        actual = dict.fromkeys(RUNNING_FIELDS, 0)
+        for totals in scores.aggregate([numeric, {'$group': {
+            '_id': None,
+            'count': {'$sum': 1},
+            'paid': {'$sum': {'$cond': [{'$eq': ['$paid', True]}, 1, 0]}},
+            'sum': {'$sum': f'${field}'},
+            'sum_sq': {'$sum': {'$multiply': [f'${field}', f'${field}']}}
+        }}]):
+            actual.update({name: totals[name] for name in ('count', 'paid', 'sum', 'sum_sq')})
+
+        bucket = {'$multiply': [
+            {'$min': [{'$floor': {'$divide': [{'$max': [f'${field}', 0]}, BUCKET_WIDTH]}}, len(BUCKETS) - 1]},
+            BUCKET_WIDTH
+        ]}
+        for row in scores.aggregate([numeric, {'$group': {'_id': bucket, 'count': {'$sum': 1}}}]):
+            actual[f'histogram.{int(row["_id"])}'] = row['count']
+
+        summaries = scores.aggregate([
+            numeric,
+            {'$sort': {'user_id': 1, 'timestamp': 1}},
+            {'$group': {
+                '_id': '$user_id',
+                'first_score': {'$first': f'${field}'},
+                'first_at': {'$first': '$timestamp'},
+                'latest_score': {'$last': f'${field}'},
+                'latest_at': {'$last': '$timestamp'},
+                'count': {'$sum': 1}
+            }}
+        ], allowDiskUse=True)
+
+        replacements = []
+        for summary in summaries:
+            user_id = summary.pop('_id')
+            summary.update(kind=kind, user_id=user_id)
+            replacements.append(ReplaceOne({'_id': f'{kind}:{user_id}'}, summary, upsert=True))
+            for name, value in zip(('repeat_users', 'improved_users', 'improvement_sum'), _improvement(summary)):
+                actual[name] += value
+            if len(replacements) >= batch_size:
+                db.score_summaries.bulk_write(replacements, ordered=False)
+                replacements = []
+        if replacements:
+            db.score_summaries.bulk_write(replacements, ordered=False)
+
+        for low in BUCKETS:
+            actual.setdefault(f'histogram.{low}', 0)
+        return db.stats.find_one_and_update(
+            {'_id': f'scores:{kind}'},
+            {'$set': dict(actual, reconciled_at=datetime.utcnow())},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
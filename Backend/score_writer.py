@@ -0,0 +1,189 @@
+import os
+import queue
+import atexit
+import time
+import logging
+import threading
+from pymongo.errors import BulkWriteError, ConnectionFailure
+from src.database.connection import db_connection
+from src.models.stats_model import StatsModel
+from src.models.score_stats_model import ScoreStatsModel
+
+# Score collection -> site-wide counter incremented for each document written
+SCORE_COUNTERS = {
+    'ats_scores': 'total_ats_checks',
+    'linkedin_scores': 'total_linkedin_reviews'
+}
+
+_STOP = object()
+DUPLICATE_KEY = 11000
+# Backoff between attempts at a batch while the database is unreachable
+RETRY_INITIAL_SECONDS = 0.5
+RETRY_MAX_SECONDS = 30.0
+
+class ScoreWriter:
+    """Write-behind buffer for score documents.
+
+    Requests enqueue scores and return immediately; a background thread
+    writes them with one insert_many per collection, then folds the batch
+    into the counters and running score statistics, flushing when batch_size scores are waiting or
+    flush_interval seconds after the first of them was queued. While the
+    database is unreachable the batch is retried with backoff. When the
+    queue is full the caller writes synchronously instead of dropping the
+    score.
+    """
+
+    def __init__(self, batch_size=100, flush_interval=1.0, max_queue=10000):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self._queue = None
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        # Counters are updated by the writer thread and by callers that overflow the queue
+        self._counter_lock = threading.Lock()
+        self._written = 0
+        self._failed = 0
+        self._batches = 0
+        self._overflowed = 0
+
+    def _ensure_started(self):
+        # Started on first use, and again after a fork, so every server process owns its own thread
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                self._queue = queue.Queue(maxsize=self.max_queue)
+                self._stopping = threading.Event()
+                self._thread = threading.Thread(target=self._run, name='score-writer', daemon=True)
+                self._pid = os.getpid()
+                self._thread.start()
+
+    def submit(self, collection_name, document):
+        """Queue a score document for collection_name"""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((collection_name, document))
+        except queue.Full:
+            self._count(overflowed=1)
+            if self._write([(collection_name, document)]):
+                self._count(failed=1)
+                logging.error(f"Failed to write {collection_name}: database unavailable")
+
+    def _count(self, written=0, failed=0, batches=0, overflowed=0):
+        with self._counter_lock:
+            self._written += written
+            self._failed += failed
+            self._batches += batches
+            self._overflowed += overflowed
+
+    def _run(self):
+        while True:
+            batch = []
+            item = self._queue.get()
+            # The batch is due flush_interval after its first score, however many follow
+            deadline = time.monotonic() + self.flush_interval
+            while item is not _STOP:
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+            if batch:
+                self._write_with_retry(batch)
+            if item is _STOP:
+                return
+
+    def _write_with_retry(self, batch):
+        delay = RETRY_INITIAL_SECONDS
+        while True:
+            batch = self._write(batch)
+            if not batch:
+                return
+            if self._stopping.is_set():
+                self._count(failed=len(batch))
+                logging.error(f"Dropped {len(batch)} scores at shutdown: database unavailable")
+                return
+            logging.warning(f"Database unavailable, retrying {len(batch)} scores in {delay:g}s")
+            self._stopping.wait(delay)
+            delay = min(delay * 2, RETRY_MAX_SECONDS)
+
+    def _write(self, batch):
+        """Write a batch; returns the scores to try again because the database could not be reached.
+
+        Scores a retry finds already written (the connection dropped after
+        they were inserted) come back as duplicate key errors on their _id
+        and are counted as written.
+        """
+        db = db_connection.get_database()
+        if db is None:
+            return batch
+
+        documents = {}
+        for collection_name, document in batch:
+            documents.setdefault(collection_name, []).append(document)
+
+        stats = StatsModel()
+        score_stats = ScoreStatsModel()
+        unwritten = []
+        for collection_name, docs in documents.items():
+            try:
+                written = len(db[collection_name].insert_many(docs, ordered=False).inserted_ids)
+                inserted = docs
+            except BulkWriteError as e:
+                # _id is the only unique index on the score collections
+                failed = {
+                    error['index'] for error in e.details.get('writeErrors', []) if error.get('code') != DUPLICATE_KEY
+                }
+                inserted = [doc for index, doc in enumerate(docs) if index not in failed]
+                written = len(inserted)
+                if failed:
+                    logging.error(f"Failed to write {len(failed)} of {len(docs)} {collection_name}: {e}")
+            except ConnectionFailure as e:
+                logging.warning(f"Lost the database while writing {len(docs)} {collection_name}: {e}")
+                unwritten += [(collection_name, doc) for doc in docs]
+                continue
+            except Exception as e:
+                written, inserted = 0, []
+                logging.error(f"Failed to write {len(docs)} {collection_name}: {e}")
+
+            if written:
+                stats.increment(SCORE_COUNTERS[collection_name], written)
+                try:
+                    score_stats.record(collection_name, inserted)
+                except Exception as e:
+                    logging.error(f"Failed to update {collection_name} statistics: {e}")
+            self._count(written=written, failed=len(docs) - written)
+        self._count(batches=1)
+        return unwritten
+
+    def stop(self, timeout=10):
+        """Flush everything queued so far and stop the writer thread"""
+        with self._lock:
+            thread = self._thread if self._pid == os.getpid() else None
+            self._thread = None
+        if thread is not None and thread.is_alive():
+            self._stopping.set()
+            self._queue.put(_STOP, timeout=timeout)
+            thread.join(timeout)
+
+    def stats(self):
+        with self._counter_lock:
+            return {
+                'queue_depth': self._queue.qsize() if self._queue is not None and self._pid == os.getpid() else 0,
+                'max_queue': self.max_queue,
+                'written': self._written,
+                'failed': self._failed,
+                'batches': self._batches,
+                'overflowed': self._overflowed
+            }
+
+# Global score writer, shared by UserModel instances
+score_writer = ScoreWriter(
+    batch_size=int(os.getenv('SCORE_WRITER_BATCH_SIZE', 100)),
+    flush_interval=float(os.getenv('SCORE_WRITER_FLUSH_SECONDS', 1.0)),
+    max_queue=int(os.getenv('SCORE_WRITER_MAX_QUEUE', 10000))
+)
+atexit.register(score_writer.stop)
@@ -0,0 +1,191 @@
+import os
+import re
+import gzip
+import hashlib
+import logging
+import mimetypes
+from flask import Response, request, send_file
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Files up to this size are held in memory; larger ones are streamed from disk
+STATIC_MAX_MEMORY_FILE = int(os.getenv('STATIC_MAX_MEMORY_FILE', 8 * 1024 * 1024))
+# Used when an asset has no prebuilt .br; every server process compresses at startup, so keep it cheap
+STATIC_BROTLI_QUALITY = int(os.getenv('STATIC_BROTLI_QUALITY', 5))
+STATIC_GZIP_LEVEL = 6
+# precompress_folder runs once per deploy, so it can afford the slowest settings
+PRECOMPRESS_BROTLI_QUALITY = 11
+PRECOMPRESS_GZIP_LEVEL = 9
+# Smaller files aren't worth compressing
+MIN_COMPRESS_SIZE = 1024
+
+COMPRESSIBLE_TYPES = {
+    'application/javascript', 'text/javascript', 'application/json', 'application/manifest+json',
+    'application/xml', 'image/svg+xml', 'application/wasm', 'image/x-icon', 'image/vnd.microsoft.icon',
+    'font/ttf', 'font/otf', 'application/vnd.ms-fontobject'
+}
+# Vite names build output assets/<name>-<hash>.<ext>
+HASHED_ASSET = re.compile(r'^assets/.+-[A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$')
+
+SIDECAR_SUFFIXES = ('.gz', '.br')
+# Content type for a static file that is itself compressed, e.g. a downloadable .tar.gz
+COMPRESSED_FILE_TYPES = {'gzip': 'application/gzip', 'br': 'application/x-brotli'}
+
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE = 'no-cache'
+
+class StaticAsset:
+    """One file of the static folder with its precompressed variants"""
+
+    def __init__(self, path, full_path, body, size, mimetype, etag, cache_control):
+        self.path = path
+        self.full_path = full_path
+        self.body = body
+        self.size = size
+        self.mimetype = mimetype
+        self.etag = etag
+        self.cache_control = cache_control
+        # encoding -> (body, etag)
+        self.variants = {}
+
+def is_compressible(mimetype):
+    return mimetype.startswith('text/') or mimetype in COMPRESSIBLE_TYPES
+
+def _read_sidecar(full_path, suffix):
+    # Prebuilt variants (e.g. from vite-plugin-compression) are used as-is
+    sidecar = full_path + suffix
+    if os.path.isfile(sidecar):
+        with open(sidecar, 'rb') as f:
+            return f.read()
+    return None
+
+def _is_sidecar(filename, filenames):
+    # x.gz / x.br are variants of x only when x is there too; otherwise they are files in their own right
+    return filename.endswith(SIDECAR_SUFFIXES) and filename[:-3] in filenames
+
+def _guess_type(path):
+    mimetype, encoding = mimetypes.guess_type(path)
+    if encoding:
+        return COMPRESSED_FILE_TYPES.get(encoding, 'application/octet-stream')
+    return mimetype or 'application/octet-stream'
+
+def _load_asset(path, full_path):
+    size = os.path.getsize(full_path)
+    mimetype = _guess_type(path)
+    cache_control = IMMUTABLE_CACHE if HASHED_ASSET.match(path) else REVALIDATE_CACHE
+
+    if size > STATIC_MAX_MEMORY_FILE:
+        digest = hashlib.sha256()
+        with open(full_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return StaticAsset(path, full_path, None, size, mimetype, digest.hexdigest()[:32], cache_control)
+
+    with open(full_path, 'rb') as f:
+        body = f.read()
+    etag = hashlib.sha256(body).hexdigest()[:32]
+    asset = StaticAsset(path, full_path, body, size, mimetype, etag, cache_control)
+
+    if size >= MIN_COMPRESS_SIZE and is_compressible(mimetype):
+        compressed = {
+            'br': _read_sidecar(full_path, '.br'),
+            'gzip': _read_sidecar(full_path, '.gz') or gzip.compress(body, compresslevel=STATIC_GZIP_LEVEL, mtime=0)
+        }
+        if compressed['br'] is None and brotli is not None:
+            compressed['br'] = brotli.compress(body, quality=STATIC_BROTLI_QUALITY)
+        for encoding, variant in compressed.items():
+            # Keep a variant only when it actually saves bytes
+            if variant is not None and len(variant) < size * 0.9:
+                asset.variants[encoding] = (variant, f'{etag}-{encoding}')
+    return asset
+
+def precompress_folder(folder):
+    """Write .gz and .br files beside compressible assets that lack an up-to-date one.
+
+    Run at deploy time (flask precompress-static) so server processes load
+    the variants instead of compressing at startup. Returns the number of
+    files written.
+    """
+    written = 0
+    for root, _, filenames in os.walk(folder):
+        names = set(filenames)
+        for filename in filenames:
+            full_path = os.path.join(root, filename)
+            if _is_sidecar(filename, names) or not is_compressible(_guess_type(filename)):
+                continue
+            # Files streamed from disk are served uncompressed, so their variants would go unused
+            if not MIN_COMPRESS_SIZE <= os.path.getsize(full_path) <= STATIC_MAX_MEMORY_FILE:
+                continue
+
+            with open(full_path, 'rb') as f:
+                body = f.read()
+            compressors = {'.gz': lambda: gzip.compress(body, compresslevel=PRECOMPRESS_GZIP_LEVEL, mtime=0)}
+            if brotli is not None:
+                compressors['.br'] = lambda: brotli.compress(body, quality=PRECOMPRESS_BROTLI_QUALITY)
+            for suffix, compress in compressors.items():
+                sidecar = full_path + suffix
+                if os.path.isfile(sidecar) and os.path.getmtime(sidecar) >= os.path.getmtime(full_path):
+                    continue
+                with open(sidecar, 'wb') as f:
+                    f.write(compress())
+                written += 1
+    return written
+
+class StaticManifest:
+    """Everything in the static folder, read once at startup"""
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.assets = {}
+        self.index = None
+        if folder and os.path.isdir(folder):
+            self.build()
+
+    def build(self):
+        assets = {}
+        for root, _, filenames in os.walk(self.folder):
+            names = set(filenames)
+            for filename in filenames:
+                if _is_sidecar(filename, names):
+                    continue
+                full_path = os.path.join(root, filename)
+                path = os.path.relpath(full_path, self.folder).replace(os.sep, '/')
+                try:
+                    assets[path] = _load_asset(path, full_path)
+                except OSError as e:
+                    logging.error(f"Failed to load static file {path}: {e}")
+        self.assets = assets
+        self.index = assets.get('index.html')
+        logging.info(f"Static manifest: {len(assets)} files from {self.folder}")
+
+    def get(self, path):
+        return self.assets.get(path)
+
+def asset_response(asset):
+    """Response for a manifest asset: picks br/gzip from Accept-Encoding and answers If-None-Match"""
+    body, etag, encoding = asset.body, asset.etag, None
+    for candidate in ('br', 'gzip'):
+        if candidate in asset.variants and request.accept_encodings[candidate]:
+            body, etag = asset.variants[candidate]
+            encoding = candidate
+            break
+
+    headers = {'ETag': f'"{etag}"', 'Cache-Control': asset.cache_control}
+    if asset.variants:
+        headers['Vary'] = 'Accept-Encoding'
+
+    if request.if_none_match.contains(etag):
+        return Response(status=304, headers=headers)
+
+    if body is None:
+        response = send_file(asset.full_path, mimetype=asset.mimetype, etag=False, conditional=True)
+        response.headers.update(headers)
+        return response
+
+    response = Response(body, mimetype=asset.mimetype, headers=headers)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    return response
@@ -0,0 +1,122 @@
+from src.database.connection import db_connection
+from datetime import datetime
+import random
+import os
+
+# Counters are split across shard documents so concurrent increments don't contend on one document
+COUNTER_SHARDS = int(os.getenv('STATS_COUNTER_SHARDS', 8))
+TOTAL_FIELDS = ('total_users', 'total_ats_checks', 'total_linkedin_reviews')
+
+class StatsModel:
+    @property
+    def db(self):
+        return db_connection.get_database()
+
+    @property
+    def collection(self):
+        db = self.db
+        return db.stats if db is not None else None
+
+    def _shard_ids(self):
+        return [f'totals:{shard}' for shard in range(COUNTER_SHARDS)]
+
+    def increment(self, field, amount=1):
+        if self.collection is None:
+            return False
+        try:
+            shard = random.randrange(COUNTER_SHARDS)
+            self.collection.update_one({'_id': f'totals:{shard}'}, {'$inc': {field: amount}}, upsert=True)
+            return True
+        except Exception as e:
+            print(f"Error incrementing {field}: {e}")
+            return False
+
+    def get_totals(self):
+        """Site-wide totals summed from the counter shards.
+
+        They only cover writes made since the counters were seeded, so run
+        the reconcile-stats command once on an existing database.
+        """
+        totals = {field: 0 for field in TOTAL_FIELDS}
+        if self.collection is None:
+            return totals
+
+        for shard in self.collection.find({'_id': {'$in': self._shard_ids()}}):
+            for field in TOTAL_FIELDS:
+                totals[field] += shard.get(field, 0)
+        return totals
+
+    def get_dashboard(self, since):
+        """Totals plus users created since `since`, in one aggregation.
+
+        The $match on created_at is served by the users index; the $facet
+        then computes the recent-user figures from those documents alone and
+        the counter shards are joined in with $lookup.
+        """
+        if self.db is None:
+            return None
+
+        pipeline = [
+            {'$match': {'created_at': {'$gte': since}}},
+            {'$facet': {
+                'recent_users': [{'$count': 'count'}],
+                'signups_by_day': [
+                    {'$group': {
+                        '_id': {'$dateToString': {'format': '%Y-%m-%d', 'date': '$created_at'}},
+                        'count': {'$sum': 1}
+                    }},
+                    {'$sort': {'_id': 1}}
+                ]
+            }},
+            {'$lookup': {
+                'from': 'stats',
+                'pipeline': [
+                    {'$match': {'_id': {'$in': self._shard_ids()}}},
+                    {'$group': dict({'_id': None}, **{field: {'$sum': f'${field}'} for field in TOTAL_FIELDS})}
+                ],
+                'as': 'totals'
+            }}
+        ]
+        result = next(self.db.users.aggregate(pipeline), {})
+
+        # Seeded by the reconcile-stats command, never from this request path
+        totals = (result.get('totals') or [{}])[0]
+        dashboard = {field: totals.get(field, 0) for field in TOTAL_FIELDS}
+
+        recent = result.get('recent_users') or [{}]
+        dashboard['recent_users'] = recent[0].get('count', 0)
+        dashboard['signups_by_day'] = [
+            {'date': day['_id'], 'count': day['count']} for day in result.get('signups_by_day', [])
+        ]
+        return dashboard
+
+    def reconcile(self):
+        """Recompute the totals from the source collections and correct the counters.
+
+        Run from the reconcile-stats command, not the request path. The
+        counts and the shard read are separate queries, so a write landing
+        between them can be counted twice or missed; run it again, or while
+        writes are quiet, if the totals must be exact.
+        """
+        totals = {field: 0 for field in TOTAL_FIELDS}
+        if self.collection is None:
+            return totals
+
+        actual = {
+            'total_users': self.db.users.count_documents({}),
+            'total_ats_checks': self.db.ats_scores.count_documents({}),
+            'total_linkedin_reviews': self.db.linkedin_scores.count_documents({})
+        }
+
+        current = dict(totals)
+        for shard in self.collection.find({'_id': {'$in': self._shard_ids()}}):
+            for field in TOTAL_FIELDS:
+                current[field] += shard.get(field, 0)
+
+        correction = {field: actual[field] - current[field] for field in TOTAL_FIELDS}
+        self.collection.update_one(
+            {'_id': 'totals:0'},
+            {'$inc': correction, '$set': {'reconciled_at': datetime.utcnow()}},
+            upsert=True
+        )
+        return actual
@@ -1,123 +1,317 @@
 from src.database.connection import db_connection
+from src.models.stats_model import StatsModel
+from src.services.score_writer import score_writer
+from src.services.cache import TTLCache
 from bson import ObjectId
+from pymongo import DESCENDING, ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
 from datetime import datetime
-import bcrypt
+import hashlib
 import os
 
+# Score history pages: default size and the most a client may ask for
+HISTORY_PAGE_SIZE = 20
+HISTORY_MAX_PAGE_SIZE = 100
+
+# Profiles read by /api/auth/me, shared by every UserModel in this process.
+# Writes made by other processes only show up once the entry expires.
+profile_cache = TTLCache(
+    'user_profiles',
+    max_entries=int(os.getenv('USER_CACHE_MAX_ENTRIES', 10000)),
+    max_bytes=int(os.getenv('USER_CACHE_MAX_BYTES', 8 * 1024 * 1024)),
+    ttl_seconds=int(os.getenv('USER_CACHE_TTL_SECONDS', 60))
+)
+
+def legacy_score_id(user_id, field, index):
+    """Stable _id for the index-th score of a user's legacy score array"""
+    return ObjectId(hashlib.sha256(f'{user_id}:{field}:{index}'.encode()).digest()[:12])
+
 class UserModel:
     def __init__(self):
-        self.db = db_connection.get_database()
-        if self.db:
-            self.collection = self.db.users
-        else:
-            self.collection = None
-    
-    def create_user(self, phone_number, is_admin=False):
-        if not self.collection:
-            return None
-            
-        # Check if user already exists
-        existing_user = self.find_user_by_phone(phone_number)
-        if existing_user:
-            return str(existing_user['_id'])
-        
-        user_data = {
-            'phone_number': phone_number,
-            'is_admin': is_admin,
-            'created_at': datetime.utcnow(),
-            'last_login': None,
-            'ats_scores': [],
-            'linkedin_scores': []
-        }
-        
-        try:
-            result = self.collection.insert_one(user_data)
-            return str(result.inserted_id)
-        except Exception as e:
-            print(f"Error creating user: {e}")
-            return None
+        self.stats = StatsModel()
+    
+    # Collections are looked up on each use, so models can be built before
+    # the database is reachable and stop using it while it is down
+    @property
+    def db(self):
+        return db_connection.get_database()
+    
+    @property
+    def collection(self):
+        db = self.db
+        return db.users if db is not None else None
+    
+    @property
+    def ats_collection(self):
+        db = self.db
+        return db.ats_scores if db is not None else None
+    
+    @property
+    def linkedin_collection(self):
+        db = self.db
+        return db.linkedin_scores if db is not None else None
     
     def find_user_by_phone(self, phone_number):
-        if not self.collection:
+        if self.collection is None:
             return None
         return self.collection.find_one({'phone_number': phone_number})
     
     def find_user_by_id(self, user_id):
-        if not self.collection:
+        if self.collection is None:
             return None
+        cached = profile_cache.get(str(user_id))
+        if cached is not None:
+            return dict(cached)
         try:
-            return self.collection.find_one({'_id': ObjectId(user_id)})
+            # Skip score arrays left on documents that predate the score collections
+            user = self.collection.find_one({'_id': ObjectId(user_id)}, {'ats_scores': 0, 'linkedin_scores': 0})
         except:
             return None
+        if user:
+            profile_cache.set(str(user_id), user)
+        return user
     
-    def update_last_login(self, user_id):
-        if not self.collection:
-            return False
-        try:
-            self.collection.update_one(
-                {'_id': ObjectId(user_id)},
-                {'$set': {'last_login': datetime.utcnow()}}
-            )
-            return True
-        except:
-            return False
+    def login_user(self, phone_number, is_admin=False):
+        """Create the user if needed and stamp last_login in one atomic round trip.
+        
+        Returns the user document, or None if the database is unavailable.
+        """
+        if self.collection is None:
+            return None
+        
+        now = datetime.utcnow()
+        for attempt in range(2):
+            try:
+                user = self.collection.find_one_and_update(
+                    {'phone_number': phone_number},
+                    {
+                        '$set': {'last_login': now},
+                        '$setOnInsert': {'phone_number': phone_number, 'is_admin': is_admin, 'created_at': now}
+                    },
+                    projection={'ats_scores': 0, 'linkedin_scores': 0},
+                    upsert=True,
+                    return_document=ReturnDocument.AFTER
+                )
+                break
+            except DuplicateKeyError:
+                # A concurrent login inserted the same phone number first; the retry matches it
+                if attempt:
+                    return None
+            except Exception as e:
+                print(f"Error logging in user: {e}")
+                return None
+        
+        # Only the upsert that inserted the document stamps both fields with this login's time;
+        # users created before created_at was recorded have none
+        if user.get('created_at') == user['last_login']:
+            self.stats.increment('total_users')
+        profile_cache.delete(str(user['_id']))
+        return user
     
     def add_ats_score(self, user_id, score_data):
-        if not self.collection:
+        return self._add_score(self.ats_collection, user_id, score_data)
+    
+    def add_linkedin_score(self, user_id, score_data):
+        return self._add_score(self.linkedin_collection, user_id, score_data)
+    
+    def _add_score(self, collection, user_id, score_data):
+        """Queue a score for the background writer; it is saved within a flush interval"""
+        if collection is None:
             return False
         try:
-            self.collection.update_one(
-                {'_id': ObjectId(user_id)},
-                {'$push': {'ats_scores': score_data}}
-            )
+            score_writer.submit(collection.name, dict(score_data, user_id=ObjectId(user_id)))
+            profile_cache.delete(str(user_id))
             return True
         except:
             return False
     
-    def add_linkedin_score(self, user_id, score_data):
-        if not self.collection:
-            return False
+    def get_ats_history(self, user_id, limit, before=None):
+        fields = {'_id': 0, 'filename': 1, 'score': 1, 'timestamp': 1, 'paid': 1}
+        return self._get_score_page(self.ats_collection, user_id, fields, limit, before)
+    
+    def get_linkedin_history(self, user_id, limit, before=None):
+        fields = {'_id': 0, 'profile_url': 1, 'overall_score': 1, 'timestamp': 1, 'paid': 1}
+        return self._get_score_page(self.linkedin_collection, user_id, fields, limit, before)
+    
+    def _get_score_page(self, collection, user_id, fields, limit, before=None):
+        """Newest-first page of a user's scores older than `before`; returns (scores, has_more)"""
+        if collection is None:
+            return [], False
+        
+        query = {'user_id': ObjectId(user_id)}
+        if before is not None:
+            query['timestamp'] = {'$lt': before}
+        
         try:
-            self.collection.update_one(
-                {'_id': ObjectId(user_id)},
-                {'$push': {'linkedin_scores': score_data}}
-            )
-            return True
+            # Fetch one extra document to learn whether another page exists
+            scores = list(collection.find(query, fields).sort('timestamp', DESCENDING).limit(limit + 1))
         except:
-            return False
+            return [], False
+        return scores[:limit], len(scores) > limit
+    
+    def get_users_page(self, limit, after=None):
+        """Newest-first page of users after a (created_at, _id) cursor; returns (users, has_more).
+        
+        Users without a created_at date (legacy accounts) come after all the
+        others, newest _id first; their cursors carry a created_at of None.
+        
+        Score counts are computed in the database: the size of any legacy
+        embedded array plus a per-user count from the score collections,
+        joined on the user_id index (localField with a pipeline needs
+        MongoDB 5.0 or later).
+        """
+        if self.collection is None:
+            return [], False
+        
+        dated = {'created_at': {'$type': 'date'}}
+        undated = {'created_at': {'$not': {'$type': 'date'}}}
+        created_at, user_id = after if after is not None else (None, None)
+        
+        def count_scores(collection_name):
+            return {'$lookup': {
+                'from': collection_name,
+                'localField': '_id',
+                'foreignField': 'user_id',
+                'pipeline': [{'$count': 'count'}],
+                'as': collection_name
+            }}
+        
+        def score_total(collection_name):
+            return {'$add': [
+                {'$sum': f'${collection_name}.count'},
+                {'$size': {'$ifNull': [f'$legacy_{collection_name}', []]}}
+            ]}
+        
+        def page(match, sort, count):
+            return list(self.collection.aggregate([
+                {'$match': match},
+                {'$sort': sort},
+                {'$limit': count},
+                *summary
+            ]))
+        
+        summary = [
+            {'$project': {
+                'phone_number': 1,
+                'is_admin': 1,
+                'created_at': 1,
+                'last_login': 1,
+                'legacy_ats_scores': '$ats_scores',
+                'legacy_linkedin_scores': '$linkedin_scores'
+            }},
+            count_scores('ats_scores'),
+            count_scores('linkedin_scores'),
+            {'$project': {
+                'phone_number': 1,
+                'is_admin': 1,
+                'created_at': 1,
+                'last_login': 1,
+                'ats_checks': score_total('ats_scores'),
+                'linkedin_reviews': score_total('linkedin_scores')
+            }}
+        ]
+        
+        users = []
+        if after is None or created_at is not None:
+            match = dated
+            if after is not None:
+                match = {'$and': [dated, {'$or': [
+                    {'created_at': {'$lt': created_at}},
+                    {'created_at': created_at, '_id': {'$lt': user_id}}
+                ]}]}
+            users = page(match, {'created_at': -1, '_id': -1}, limit + 1)
+        if len(users) <= limit:
+            # Past the dated users, carry on with the undated ones
+            match = undated
+            if after is not None and created_at is None:
+                match = {'$and': [undated, {'_id': {'$lt': user_id}}]}
+            users += page(match, {'_id': -1}, limit + 1 - len(users))
+        return users[:limit], len(users) > limit
     
+    def migrate_score_history(self, batch_size=200):
+        """Move score arrays embedded in user documents into the score collections.
+        
+        Safe to re-run: each score is upserted on an _id derived from the
+        user, the array and its position in it, and the arrays are only
+        removed once their scores have been written. Counts are of scores
+        actually inserted. The counters and score statistics do not see
+        them until reconcile-stats is run.
+        """
+        moved = {'users': 0, 'ats_scores': 0, 'linkedin_scores': 0}
+        if self.collection is None:
+            return moved
+        
+        query = {'$or': [{'ats_scores': {'$exists': True}}, {'linkedin_scores': {'$exists': True}}]}
+        cursor = self.collection.find(query, {'ats_scores': 1, 'linkedin_scores': 1}, batch_size=batch_size)
+        for user in cursor:
+            for field, collection in (('ats_scores', self.ats_collection), ('linkedin_scores', self.linkedin_collection)):
+                scores = user.get(field) or []
+                if not scores:
+                    continue
+                operations = [
+                    UpdateOne(
+                        {'_id': legacy_score_id(user['_id'], field, index)},
+                        {'$setOnInsert': dict(score, user_id=user['_id'])},
+                        upsert=True
+                    )
+                    for index, score in enumerate(scores)
+                ]
+                moved[field] += collection.bulk_write(operations, ordered=False).upserted_count
+            
+            self.collection.update_one({'_id': user['_id']}, {'$unset': {'ats_scores': '', 'linkedin_scores': ''}})
+            moved['users'] += 1
+        
+        return moved
+    
+    def iter_users_with_scores(self, batch_size=500):
+        """Every user with their ATS and LinkedIn history, oldest account first.
+
+        Users are read batch_size at a time from one cursor, and each batch's
+        scores with one query per score collection, so memory stays flat
+        however many users there are.
+        """
+        if self.collection is None:
+            return
+
+        fields = {'phone_number': 1, 'is_admin': 1, 'created_at': 1, 'last_login': 1}
+        cursor = self.collection.find({}, fields, batch_size=batch_size).sort('_id', 1)
+        batch = []
+        for user in cursor:
+            batch.append(user)
+            if len(batch) >= batch_size:
+                yield from self._attach_scores(batch)
+                batch = []
+        if batch:
+            yield from self._attach_scores(batch)
+
+    def _attach_scores(self, users):
+        user_ids = [user['_id'] for user in users]
+        histories = (
+            ('ats_scores', self.ats_collection, {'_id': 0, 'user_id': 1, 'filename': 1, 'score': 1, 'paid': 1, 'timestamp': 1}),
+            ('linkedin_scores', self.linkedin_collection, {'_id': 0, 'user_id': 1, 'profile_url': 1, 'overall_score': 1, 'paid': 1, 'timestamp': 1})
+        )
+        scores = {}
+        for field, collection, projection in histories:
+            by_user = scores[field] = {}
+            query = collection.find({'user_id': {'$in': user_ids}}, projection).sort([('user_id', 1), ('timestamp', DESCENDING)])
+            for score in query:
+                by_user.setdefault(score.pop('user_id'), []).append(score)
+
+        for user in users:
+            for field, _, _ in histories:
+                user[field] = scores[field].get(user['_id'], [])
+            yield user
+
     def is_admin_phone(self, phone_number):
         admin_phone = os.getenv('ADMIN_PHONE', '+91-7697470397')
         return phone_number == admin_phone
     
     def get_user_stats(self):
-        if not self.collection:
+        """Site-wide totals, read from counters maintained at write time"""
+        if self.collection is None:
             return {'total_users': 0, 'total_ats_checks': 0, 'total_linkedin_reviews': 0}
         
         try:
-            total_users = self.collection.count_documents({})
-            
-            # Count total ATS checks
-            pipeline_ats = [
-                {'$unwind': '$ats_scores'},
-                {'$count': 'total'}
-            ]
-            ats_result = list(self.collection.aggregate(pipeline_ats))
-            total_ats = ats_result[0]['total'] if ats_result else 0
-            
-            # Count total LinkedIn reviews
-            pipeline_linkedin = [
-                {'$unwind': '$linkedin_scores'},
-                {'$count': 'total'}
-            ]
-            linkedin_result = list(self.collection.aggregate(pipeline_linkedin))
-            total_linkedin = linkedin_result[0]['total'] if linkedin_result else 0
-            
-            return {
-                'total_users': total_users,
-                'total_ats_checks': total_ats,
-                'total_linkedin_reviews': total_linkedin
-            }
+            return self.stats.get_totals()
         except:
             return {'total_users': 0, 'total_ats_checks': 0, 'total_linkedin_reviews': 0}
-